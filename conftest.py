@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""Makes the packages of the repository importable by the tests."""
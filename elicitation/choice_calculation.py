@@ -1,12 +1,189 @@
 # -*- coding: utf-8 -*-
 """Everything to compute the regret."""
 
+import time
 import numpy as np
-from scipy.optimize import linprog
+from elicitation.polytope import Polytope
+from elicitation.linear_program import compute_vertices, count_vertex_systems, MAX_VERTEX_SYSTEMS, \
+    make_linear_program, get_backend
 
-def pmr_polytope(alternatives, polytope, model):
+#Cost of one LP for each backend, in elementary operations of the vertex enumeration, timed
+#once with calibrate_methods (its probe LP has 5 parameters and 14 constrainsts).
+LP_OPERATIONS = {'linprog': 2 * 10**5, 'highs': 2 * 10**4, 'numpy': 2 * 10**4}
+LP_OPERATIONS_SIZE = 70
+
+_cost_model = None
+
+def get_opti_alternatives(alternatives, model):
+    """
+    The correct form of all the alternatives for optimisation.
+
+    Parameters
+    ----------
+    alternatives : array_like
+        Alternatives.
+    model : Model
+        The Model.
+
+    Returns
+    -------
+    array_like
+        One row per alternative.
+
+    """
+    return np.asarray([model.get_opti_alternative(alternative) for alternative in alternatives])
+
+def pmr_polytope(alternatives, polytope, model, method = 'auto', rows = None, columns = None):
+    """
+    Compute the PMR. It is kept in the polytope with the weights maximising
+    each pair and reused as long as the region does not change. Once the
+    polytope is cut, only the pairs whose maximising weights are cut off are
+    computed again.
+
+    Parameters
+    ----------
+    alternatives : array_like
+        Alternatives.
+    polytope : Polyope
+        The Polytope.
+    model : Model
+        The Model.
+    method : string, optional
+        'vertices', 'linprog' or 'auto', see maximize_polytope. The default is 'auto'.
+    rows : array_like, optional
+        Only compute the pairs of these rows, None for all. The default is None.
+    columns : array_like, optional
+        Only compute the pairs of these columns, None for all. The default is None.
+
+    Returns
+    -------
+    array_like
+        PMR (-inf for the pairs not computed).
+
+    """
+    _update_pmr(alternatives, polytope, model, method, rows = rows, columns = columns)
+    pmr, _, _, stale = polytope.get_pmr(alternatives, model)
+    if not np.any(stale):
+        return pmr
+    return np.where(stale, float('-inf'), pmr)
+
+def evaluate_polytope(alternatives, polytope, model, method = 'auto'):
+    """
+    Compute together the PMR, the MR, the min and the max of each
+    alternative on a polytope, with one call to maximize_polytope (the
+    same vertex scores or LP solver) for all of them.
+
+    Parameters
+    ----------
+    alternatives : array_like
+        Alternatives.
+    polytope : Polyope
+        The Polytope.
+    model : Model
+        The Model.
+    method : string, optional
+        'vertices', 'linprog' or 'auto', see maximize_polytope. The default is 'auto'.
+
+    Returns
+    -------
+    dict
+        PMR ('pmr'), MR ('mr'), min ('min') and max ('max').
+
+    """
+    opti_alternatives = get_opti_alternatives(alternatives, model)
+    pmr, values = _update_pmr(alternatives, polytope, model, method,
+                              np.vstack((-opti_alternatives, opti_alternatives)))
+    nb_alternatives = len(alternatives)
+    res = {}
+    res['pmr'] = pmr
+    res['mr'] = mr_polytope(pmr)
+    res['min'] = -values[0:nb_alternatives]
+    res['max'] = values[nb_alternatives:]
+    return res
+
+def _update_pmr(alternatives, polytope, model, method, objectives = None, rows = None,
+                columns = None):
+    """
+    Compute the pairs of the PMR kept in the polytope which are missing, and
+    maximise other objectives in the same call.
+
+    Parameters
+    ----------
+    alternatives : array_like
+        Alternatives.
+    polytope : Polyope
+        The Polytope.
+    model : Model
+        The Model.
+    method : string
+        'vertices', 'linprog' or 'auto', see maximize_polytope.
+    objectives : array_like, optional
+        2-D array, other objectives to maximise. The default is None.
+    rows : array_like, optional
+        Only compute the pairs of these rows, None for all. The default is None.
+    columns : array_like, optional
+        Only compute the pairs of these columns, None for all. The default is None.
+
+    Returns
+    -------
+    array_like
+        PMR (the pairs not computed, out of rows or columns, are not exact).
+    array_like
+        The max of the other objectives.
+
+    """
+    nb_alternatives, nb_parameters = alternatives.shape
+    if objectives is None:
+        objectives = np.empty((0, nb_parameters))
+    pmr, points, argmax, stale = polytope.get_pmr(alternatives, model)
+    if pmr is None:
+        pmr = np.zeros((nb_alternatives, nb_alternatives))
+        points = np.empty((0, nb_parameters))
+        argmax = np.full((nb_alternatives, nb_alternatives), -1)
+        stale = ~np.eye(nb_alternatives, dtype = bool)
+    to_compute = stale.copy()
+    if rows is not None:
+        out_rows = np.ones(nb_alternatives, dtype = bool)
+        out_rows[rows] = False
+        to_compute[out_rows,:] = False
+    if columns is not None:
+        out_columns = np.ones(nb_alternatives, dtype = bool)
+        out_columns[columns] = False
+        to_compute[:,out_columns] = False
+    pairs_i, pairs_j = np.nonzero(to_compute)
+    if len(pairs_i) + len(objectives) == 0:
+        return pmr, np.empty(0)
+    opti_alternatives = get_opti_alternatives(alternatives, model)
+    all_values, new_points, all_argmax = maximize_polytope(polytope,
+                                                           np.vstack((opti_alternatives[pairs_j] -
+                                                                      opti_alternatives[pairs_i],
+                                                                      objectives)),
+                                                           method)
+    if len(pairs_i) == 0:
+        return pmr, all_values
+    values = all_values[0:len(pairs_i)]
+    new_argmax = all_argmax[0:len(pairs_i)]
+    pmr = pmr.copy()
+    pmr[pairs_i, pairs_j] = values
+    argmax = argmax.copy()
+    argmax[pairs_i, pairs_j] = np.where(new_argmax >= 0, new_argmax + len(points), -1)
+    points = np.vstack((points, new_points))
+    #Only keep the weights still maximising a pair.
+    used = np.unique(argmax[argmax >= 0])
+    new_rows = np.full(len(points) + 1, -1) #The last one for -1.
+    new_rows[used] = np.arange(0, len(used))
+    argmax = new_rows[argmax]
+    polytope.set_pmr(pmr, points[used], argmax, alternatives, model, stale & ~to_compute)
+    return pmr, all_values[len(pairs_i):]
+
+def lazy_mr_argmin(alternatives, polytope, model, eligible = None, method = 'auto',
+                   columns = None):
     """
-    Compute the PMR.
+    Find the alternative with the minimal MR on a polytope, only computing
+    the PMR rows which could have it. The PMR kept in the polytope gives a
+    lower bound of each MR: exact pairs, and for the others the regret at
+    the weights still in the polytope. The row with the lowest bound is
+    computed until the lowest bound is exact.
 
     Parameters
     ----------
@@ -16,6 +193,216 @@ def pmr_polytope(alternatives, polytope, model):
         The Polytope.
     model : Model
         The Model.
+    eligible : array_like, optional
+        1-D array of booleans, the alternatives which can be chosen. The
+        default is None (all).
+    method : string, optional
+        'vertices', 'linprog' or 'auto', see maximize_polytope. The default is 'auto'.
+    columns : array_like, optional
+        1-D array of booleans, the only columns which can give the MR (see
+        prune_alternatives). The default is None (all).
+
+    Returns
+    -------
+    integer
+        The alternative with the minimal MR (-1 if none is eligible).
+    float
+        Its MR (its row of the PMR kept in the polytope is exact on columns).
+
+    """
+    nb_alternatives = len(alternatives)
+    if eligible is None:
+        eligible = np.ones(nb_alternatives, dtype = bool)
+    if not np.any(eligible):
+        return -1, float('inf')
+    if columns is None:
+        columns = np.ones(nb_alternatives, dtype = bool)
+    while True:
+        lower_bounds, stale = _pmr_lower_bounds(alternatives, polytope, model)
+        mr_lower_bounds = np.max(lower_bounds, axis = 1)
+        mr_lower_bounds[~eligible] = float('inf')
+        best_alt_id = np.argmin(mr_lower_bounds)
+        if not np.any(stale[best_alt_id, columns]):
+            return best_alt_id, mr_lower_bounds[best_alt_id]
+        _update_pmr(alternatives, polytope, model, method, rows = [best_alt_id],
+                    columns = columns)
+
+def _pmr_lower_bounds(alternatives, polytope, model):
+    """
+    Lower bounds of the PMR from what is kept in the polytope.
+
+    Parameters
+    ----------
+    alternatives : array_like
+        Alternatives.
+    polytope : Polyope
+        The Polytope.
+    model : Model
+        The Model.
+
+    Returns
+    -------
+    array_like
+        Lower bounds of the PMR (exact out of the stale pairs).
+    array_like
+        2-D array of booleans, the stale pairs.
+
+    """
+    nb_alternatives = len(alternatives)
+    pmr, points, argmax, stale = polytope.get_pmr(alternatives, model)
+    if pmr is None:
+        lower_bounds = np.full((nb_alternatives, nb_alternatives), float('-inf'))
+        np.fill_diagonal(lower_bounds, 0)
+        return lower_bounds, ~np.eye(nb_alternatives, dtype = bool)
+    lower_bounds = pmr.copy()
+    #The weights maximising a pair which is not stale are still in the polytope.
+    in_points = np.unique(argmax[~stale & (argmax >= 0)])
+    if len(in_points) == 0:
+        lower_bounds[stale] = float('-inf')
+    else:
+        scores = points[in_points] @ get_opti_alternatives(alternatives, model).T
+        regrets = np.max(scores[:,np.newaxis,:] - scores[:,:,np.newaxis], axis = 0)
+        lower_bounds[stale] = regrets[stale]
+    return lower_bounds, stale
+
+def prune_alternatives(alternatives, polytope_list, model, active = None):
+    """
+    Find the alternatives which cannot give the MR of any alternative on
+    any of the polytopes: the ones with a PMR <= 0 against another active
+    alternative (dominated), and the ones which are not optimal for any
+    weights (not potentially optimal). The polytopes are only cut later, so
+    they stay out. The dominance is checked on the vertices already computed
+    (else on the PMR kept in the polytope), potential optimality first on the
+    weights known in the polytopes, then with one LP per polytope.
+
+    Parameters
+    ----------
+    alternatives : array_like
+        Alternatives.
+    polytope_list : list
+        The polytopes.
+    model : Model
+        The Model.
+    active : array_like, optional
+        1-D array of booleans, the alternatives still active. The default is
+        None (all).
+
+    Returns
+    -------
+    array_like
+        1-D array of booleans, the alternatives still active.
+
+    """
+    nb_alternatives = len(alternatives)
+    if active is None:
+        active = np.ones(nb_alternatives, dtype = bool)
+    active = active.copy()
+    opti_alternatives = get_opti_alternatives(alternatives, model)
+    dominated = np.ones((nb_alternatives, nb_alternatives), dtype = bool)
+    np.fill_diagonal(dominated, False)
+    for polytope in polytope_list:
+        #dominated[k,j]: j never better than k.
+        vertices = polytope.get_vertices(compute = False)
+        if vertices is not None and len(vertices) != 0:
+            scores = vertices @ opti_alternatives.T
+            dominated &= np.all(scores[:,np.newaxis,:] <= scores[:,:,np.newaxis], axis = 0)
+            continue
+        pmr, _, _, stale = polytope.get_pmr(alternatives, model)
+        if pmr is None:
+            dominated[:] = False
+            break
+        dominated &= ~stale & (pmr <= 0)
+    for j in np.nonzero(active)[0]:
+        if np.any(dominated[active, j]):
+            active[j] = False
+    #Optimal at a weight known in a polytope (up to the tolerance of the LPs): kept.
+    points = np.vstack([_known_points(alternatives, polytope, model) for polytope in polytope_list])
+    optimal = _optimal_at(points, opti_alternatives, active)
+    for j in np.nonzero(active & ~optimal)[0]:
+        if optimal[j]:
+            continue
+        others = active.copy()
+        others[j] = False
+        gaps = opti_alternatives[others] - opti_alternatives[j]
+        for polytope in polytope_list:
+            point = polytope.get_linear_program().find_point(gaps, np.zeros(len(gaps)))
+            if point is not None:
+                polytope.add_point(point)
+                optimal |= _optimal_at(point[np.newaxis,:], opti_alternatives, active)
+                break
+        else:
+            active[j] = False
+    return active
+
+def _optimal_at(points, opti_alternatives, active):
+    """
+    The active alternatives optimal (up to the tolerance of the LPs) for at
+    least one of the weights.
+
+    Parameters
+    ----------
+    points : array_like
+        The weights, one per row.
+    opti_alternatives : array_like
+        Alternatives, see get_opti_alternatives.
+    active : array_like
+        1-D array of booleans, the alternatives still active.
+
+    Returns
+    -------
+    array_like
+        1-D array of booleans.
+
+    """
+    scores = points @ opti_alternatives[active].T
+    optimal = np.zeros(len(opti_alternatives), dtype = bool)
+    optimal[active] = np.any(scores >= np.max(scores, axis = 1)[:,np.newaxis] - 10**-6, axis = 0)
+    return optimal
+
+def _known_points(alternatives, polytope, model):
+    """
+    The weights known to be in the polytope: the vertices if already
+    computed, the points found while checking the intersections and the
+    weights maximising the pairs of the PMR which are not stale.
+
+    Parameters
+    ----------
+    alternatives : array_like
+        Alternatives.
+    polytope : Polyope
+        The Polytope.
+    model : Model
+        The Model.
+
+    Returns
+    -------
+    array_like
+        The weights, one per row.
+
+    """
+    points = [np.empty((0, alternatives.shape[1]))]
+    if polytope.get_vertices(compute = False) is not None:
+        points.append(polytope.get_vertices(compute = False))
+    if polytope.get_points() is not None:
+        points.append(polytope.get_points())
+    pmr, pmr_points, argmax, stale = polytope.get_pmr(alternatives, model)
+    if pmr is not None:
+        points.append(pmr_points[np.unique(argmax[~stale & (argmax >= 0)])])
+    return np.vstack(points)
+
+def pmr_vertices(alternatives, vertices, model):
+    """
+    Compute the PMR from the vertices of a polytope:
+    PMR[i,j] = max over the vertices v of (v.x_j - v.x_i).
+
+    Parameters
+    ----------
+    alternatives : array_like
+        Alternatives.
+    vertices : array_like
+        Vertices of the polytope, one per row.
+    model : Model
+        The Model.
 
     Returns
     -------
@@ -24,23 +411,221 @@ def pmr_polytope(alternatives, polytope, model):
 
     """
     nb_alternatives = len(alternatives)
+    opti_alternatives = get_opti_alternatives(alternatives, model)
     pmr = np.zeros((nb_alternatives, nb_alternatives))
-    poly_a_ub, poly_b_ub, poly_a_eq, poly_b_eq= polytope.get_constrainsts()
-    poly_bounds = polytope.get_bounds()
-    for i in range(0, nb_alternatives):
-        for j in range(0, nb_alternatives):
-            if i != j:
-                alternatives_diff = model.get_diff(alternatives[j], alternatives[i])
-                linprog_res = linprog(c = -alternatives_diff, A_ub = poly_a_ub, b_ub = poly_b_ub,
-                                      A_eq = poly_a_eq, b_eq = poly_b_eq,
-                                      bounds = poly_bounds,
-                                      method = 'highs')
-                if linprog_res.fun is None:
-                    pmr[i,j] = float('inf')
-                else:
-                    pmr[i,j] = -linprog_res.fun
+    pairs_i, pairs_j = np.nonzero(~np.eye(nb_alternatives, dtype = bool))
+    pmr[pairs_i, pairs_j], _, _ = _maximize_vertices(vertices, opti_alternatives[pairs_j] -
+                                                     opti_alternatives[pairs_i])
     return pmr
 
+def maximize_polytope(polytope, objectives, method = 'auto'):
+    """
+    Maximise K objectives over a polytope in one call. On the whole simplex
+    (no answer yet), the max of an objective is directly its largest
+    coordinate, whatever the method.
+
+    Parameters
+    ----------
+    polytope : Polyope
+        The Polytope.
+    objectives : array_like
+        2-D array, one objective per row.
+    method : string, optional
+        'vertices' to use the vertices of the polytope ('linprog' if there
+        are more than MAX_VERTEX_SYSTEMS systems to enumerate them), 'linprog'
+        to solve one LP per objective, 'auto' to choose with choose_method.
+        The default is 'auto'.
+
+    Returns
+    -------
+    array_like
+        The max of each objective (inf if the polytope is empty).
+    array_like
+        The maximising weights, one per row.
+    array_like
+        For each objective, the row of the maximising weights (-1 if none).
+
+    Raises
+    ------
+    NotImplementedError
+        If the method is not known.
+
+    """
+    objectives = np.atleast_2d(objectives)
+    if polytope.is_simplex():
+        #The vertices are the unit vectors: the max is the largest coordinate.
+        return _maximize_vertices(np.eye(objectives.shape[1]), objectives)
+    if method == 'auto':
+        method = choose_method(polytope, len(objectives))
+    if method == 'vertices' and _count_vertex_systems(polytope) > MAX_VERTEX_SYSTEMS:
+        method = 'linprog' #Too many systems, the vertices are not enumerated.
+    if method == 'vertices':
+        polytope.set_method(method)
+        return _maximize_vertices(polytope.get_vertices(), objectives)
+    if method == 'linprog':
+        polytope.set_method(method)
+        optima, points = polytope.get_linear_program().minimize_all(-objectives)
+        solved = ~np.isnan(optima)
+        values = np.where(solved, -optima, float('inf'))
+        return values, points, np.where(solved, np.arange(0, len(objectives)), -1)
+    raise NotImplementedError(method, 'is an unknown method.')
+
+def calibrate_methods(force = False):
+    """
+    Time a small probe (a polytope of 5 parameters cut 4 times) to calibrate
+    the cost model of choose_method on this machine: the time of an
+    elementary operation of the vertex enumeration and the time of one LP.
+    Each repeat solves new objectives on a new LP (not warm started by the
+    previous repeat). Until it is called, choose_method uses LP_OPERATIONS,
+    so that the method chosen does not depend on the timings.
+
+    Parameters
+    ----------
+    force : bool, optional
+        Time the probe again even if already done. The default is False.
+
+    Returns
+    -------
+    dict
+        Time of an operation ('operation'), time of one LP ('lp') and the
+        size (parameters times constrainsts) of the probe LP ('lp_size').
+
+    """
+    global _cost_model
+    if _cost_model is None or force:
+        rng = np.random.default_rng(0) #Without changing the global seed.
+        nb_parameters = 5
+        polytope = Polytope(None, None, np.ones((1, nb_parameters)), [1], [(0, 1)] * nb_parameters)
+        for _ in range(0, 4):
+            constraint_a = rng.normal(size = nb_parameters)
+            polytope.add_answer(constraint_a - np.mean(constraint_a), [0], 1)
+        nb_objectives = 10
+        time_vertices = float('inf')
+        time_lp = float('inf')
+        for _ in range(0, 3):
+            start_time = time.perf_counter()
+            compute_vertices(*polytope.get_constrainsts(), polytope.get_bounds())
+            time_vertices = min(time_vertices, time.perf_counter() - start_time)
+            objectives = rng.normal(size = (nb_objectives, nb_parameters))
+            start_time = time.perf_counter()
+            linear_program = make_linear_program(*polytope.get_constrainsts(), polytope.get_bounds())
+            linear_program.minimize_all(objectives)
+            time_lp = min(time_lp, time.perf_counter() - start_time)
+        nb_inequalities = len(polytope.get_inequalities()[0])
+        _cost_model = {}
+        _cost_model['operation'] = time_vertices / _enumeration_cost(nb_parameters, 1, nb_inequalities)
+        _cost_model['lp'] = time_lp / nb_objectives
+        _cost_model['lp_size'] = nb_parameters * nb_inequalities
+    return _cost_model
+
+def get_cost_model():
+    """
+    Get the cost model used by choose_method (as calibrate_methods): the
+    one timed by calibrate_methods if called, else the fixed LP_OPERATIONS
+    of the current backend.
+    """
+    if _cost_model is not None:
+        return _cost_model
+    return {'operation': 1, 'lp': LP_OPERATIONS[get_backend()], 'lp_size': LP_OPERATIONS_SIZE}
+
+def _enumeration_cost(nb_parameters, nb_equalities, nb_inequalities):
+    """
+    Number of elementary operations to enumerate the vertices: one system to
+    solve and check for each choice of active constrainsts.
+
+    Parameters
+    ----------
+    nb_parameters : integer
+        Number of parameters.
+    nb_equalities : integer
+        Number of equalities.
+    nb_inequalities : integer
+        Number of constrainsts Ax <= b, bounds included.
+
+    Returns
+    -------
+    float
+        The number of operations.
+
+    """
+    nb_systems = float(count_vertex_systems(nb_parameters, nb_equalities, nb_inequalities))
+    return nb_systems * (nb_parameters**3 + nb_inequalities * nb_parameters)
+
+def _count_vertex_systems(polytope):
+    """
+    Number of systems to enumerate the vertices of a polytope (0 if they are
+    already known).
+    """
+    if polytope.get_vertices(compute = False) is not None:
+        return 0
+    A_ineq, _ = polytope.get_inequalities()
+    nb_equalities = len(np.atleast_2d(polytope.get_constrainsts()[2]))
+    return count_vertex_systems(A_ineq.shape[1], nb_equalities, len(A_ineq))
+
+def choose_method(polytope, nb_objectives):
+    """
+    Choose between 'vertices' and 'linprog' to maximise objectives over a
+    polytope, from the cost model (see get_cost_model): the
+    enumeration grows with the number of constrainsts at the power of the
+    dimension, the LP only linearly with the number of objectives. Once
+    known, the vertices are kept (and split by the cuts), so they are used
+    whenever known and their scores, a matrix product, are not counted.
+    Above MAX_VERTEX_SYSTEMS systems, the LP is always chosen.
+
+    Parameters
+    ----------
+    polytope : Polyope
+        The Polytope.
+    nb_objectives : integer
+        Number of objectives.
+
+    Returns
+    -------
+    string
+        'vertices' or 'linprog'.
+
+    """
+    cost_model = get_cost_model()
+    if polytope.get_vertices(compute = False) is not None:
+        return 'vertices'
+    if _count_vertex_systems(polytope) > MAX_VERTEX_SYSTEMS:
+        return 'linprog'
+    A_ineq, _ = polytope.get_inequalities()
+    nb_parameters = A_ineq.shape[1]
+    nb_equalities = len(np.atleast_2d(polytope.get_constrainsts()[2]))
+    time_vertices = cost_model['operation'] * _enumeration_cost(nb_parameters, nb_equalities,
+                                                                len(A_ineq))
+    time_lp = cost_model['lp'] * nb_objectives * \
+        max(1, nb_parameters * len(A_ineq) / cost_model['lp_size'])
+    return 'vertices' if time_vertices <= time_lp else 'linprog'
+
+def _maximize_vertices(vertices, objectives):
+    """
+    Maximise K objectives over the vertices of a polytope.
+
+    Parameters
+    ----------
+    vertices : array_like
+        Vertices of the polytope, one per row.
+    objectives : array_like
+        2-D array, one objective per row.
+
+    Returns
+    -------
+    array_like
+        The max of each objective (inf if the polytope is empty, as linprog).
+    array_like
+        The maximising weights, one per row.
+    array_like
+        For each objective, the row of the maximising weights (-1 if none).
+
+    """
+    if len(vertices) == 0:
+        return np.full(len(objectives), float('inf')), vertices, np.full(len(objectives), -1)
+    scores = vertices @ objectives.T
+    argmax = np.argmax(scores, axis = 0)
+    return scores[argmax, np.arange(0, len(objectives))], vertices, argmax
+
 def mr_polytope(pmr):
     """
     Compute the MR (from the PMR).
@@ -58,7 +643,7 @@ def mr_polytope(pmr):
     """
     return np.max(pmr, axis = 1)
 
-def min_polytope(alternatives, polytope, model):
+def min_polytope(alternatives, polytope, model, method = 'auto'):
     """
     Compute the min of each alternative on a polytope.
 
@@ -70,6 +655,8 @@ def min_polytope(alternatives, polytope, model):
         The Polytope.
     model : Model
         The Model.
+    method : string, optional
+        'vertices', 'linprog' or 'auto', see maximize_polytope. The default is 'auto'.
 
     Returns
     -------
@@ -77,23 +664,10 @@ def min_polytope(alternatives, polytope, model):
         Min.
 
     """
-    nb_alternatives = len(alternatives)
-    min_list = np.zeros((nb_alternatives))
-    poly_a_ub, poly_b_ub, poly_a_eq, poly_b_eq= polytope.get_constrainsts()
-    poly_bounds = polytope.get_bounds()
-    for i in range(0, nb_alternatives):
-        linprog_res = linprog(c = model.get_opti_alternative(alternatives[i,:]),
-                              A_ub = poly_a_ub, b_ub = poly_b_ub,
-                              A_eq = poly_a_eq, b_eq = poly_b_eq,
-                              bounds = poly_bounds,
-                              method = 'highs')
-        if linprog_res.fun is None:
-            min_list[i] = float('-inf')
-        else:
-            min_list[i] = linprog_res.fun
-    return min_list
+    values, _, _ = maximize_polytope(polytope, -get_opti_alternatives(alternatives, model), method)
+    return -values
 
-def max_polytope(alternatives, polytope, model):
+def max_polytope(alternatives, polytope, model, method = 'auto'):
     """
     Compute the max of each alternative on a polytope.
 
@@ -105,6 +679,8 @@ def max_polytope(alternatives, polytope, model):
         The Polytope.
     model : Model
         The Model.
+    method : string, optional
+        'vertices', 'linprog' or 'auto', see maximize_polytope. The default is 'auto'.
 
     Returns
     -------
@@ -112,18 +688,5 @@ def max_polytope(alternatives, polytope, model):
         Max.
 
     """
-    nb_alternatives = len(alternatives)
-    max_list = np.zeros((nb_alternatives))
-    poly_a_ub, poly_b_ub, poly_a_eq, poly_b_eq= polytope.get_constrainsts()
-    poly_bounds = polytope.get_bounds()
-    for i in range(0, nb_alternatives):
-        linprog_res = linprog(c = -model.get_opti_alternative(alternatives[i,:]),
-                              A_ub = poly_a_ub, b_ub = poly_b_ub,
-                              A_eq = poly_a_eq, b_eq = poly_b_eq,
-                              bounds = poly_bounds,
-                              method = 'highs')
-        if linprog_res.fun is None:
-            max_list[i] = float('inf')
-        else:
-            max_list[i] = -linprog_res.fun
-    return max_list
+    values, _, _ = maximize_polytope(polytope, get_opti_alternatives(alternatives, model), method)
+    return values
@@ -6,13 +6,17 @@ import numpy as np
 from alternatives.data_preparation import get_pareto_efficient_alternatives
 from elicitation.question_strategies import CSSQuestionStrategy
 from elicitation.dm import get_choice_fixed
-from elicitation.choice_calculation import pmr_polytope, mr_polytope
-from elicitation.focal_set import compute_epmr_emr
-from elicitation.choice_strategies import minimax_regret_choice
-from elicitation.polytope import Polytope, construct_constrainst, cut_polytope, intersection_checker
+from elicitation.choice_calculation import pmr_polytope, mr_polytope, evaluate_polytope, lazy_mr_argmin
+from elicitation.choice_calculation import prune_alternatives
+from elicitation.focal_set import compute_epmr_emr, compute_criteria, FocalSets
+from elicitation.choice_strategies import minimax_regret_choice, maximax_choice, maximin_choice
+from elicitation.polytope import Polytope, construct_constrainst
+from elicitation.polytope_tree import PolytopeTree
+from elicitation.spill_store import SpillStore
 
 def robust_elicitation(alternatives, model, max_iter = -1,
-                       rational = None, regret_limit = 10**-8):
+                       rational = None, regret_limit = 10**-8, pruning = False,
+                       method = 'auto'):
     """
     Robust elicitation classic with CSS.
 
@@ -28,6 +32,12 @@ def robust_elicitation(alternatives, model, max_iter = -1,
         To know if some answers should be rational or not. The default is None.
     regret_limit : float, optional
         If a regret limit. The default is 10**-8.
+    pruning : bool, optional
+        Stop computing the PMR against the alternatives which cannot give a
+        MR, see prune_alternatives. The default is False.
+    method : string, optional
+        How the PMR are computed: 'vertices', 'linprog' or 'auto' to choose
+        for each polytope, see maximize_polytope. The default is 'auto'.
 
     Returns
     -------
@@ -60,26 +70,31 @@ def robust_elicitation(alternatives, model, max_iter = -1,
 
     ite = 0
     start_time = time.time()
-
-    pmr = pmr_polytope(alternatives, first_polytope, model)
-    mr =  mr_polytope(pmr)
+    active = np.ones(nb_alternatives, dtype = bool) #Alternatives which can give a MR.
 
     while ite < max_iter:
 
-        candidate_alt, candidate_alt_id = question_strategy.give_candidate(mr)
+        #Only the PMR rows which can have the minimal MR are computed.
+        candidate_alt_id, _ = lazy_mr_argmin(alternatives, first_polytope, model,
+                                             question_strategy.get_open_alternatives(),
+                                             method, columns = active)
+        candidate_alt = alternatives[candidate_alt_id]
+        pmr = pmr_polytope(alternatives, first_polytope, model, method, rows = [candidate_alt_id],
+                           columns = question_strategy.get_open_oponents(candidate_alt_id))
         worst_alt, _ = question_strategy.give_oponent(pmr, candidate_alt_id)
         choice = get_choice_fixed(candidate_alt, worst_alt, rational[ite], model)
         best_prefered = choice['accepted']
         rational_list[ite] = choice['rational']
 
-        _, best_alt_id, regret = minimax_regret_choice(alternatives, mr)
-        if np.max(regret) <= regret_limit :# (ite != 0 and best_emr > memr_estimated_list[ite-1]) or :
+        best_alt_id, regret = lazy_mr_argmin(alternatives, first_polytope, model,
+                                             method = method, columns = active)
+        if regret <= regret_limit :# (ite != 0 and best_emr > memr_estimated_list[ite-1]) or :
             break
 
+        if pruning is True:
+            active = prune_alternatives(alternatives, [first_polytope], model, active)
         new_constraint_a, new_constraint_b = construct_constrainst(candidate_alt, worst_alt, best_prefered, model)
         first_polytope.add_answer(new_constraint_a, new_constraint_b, 1, "minimum")
-        pmr = pmr_polytope(alternatives, first_polytope, model)
-        mr =  mr_polytope(pmr)
 
         ite = ite+1
 
@@ -90,12 +105,15 @@ def robust_elicitation(alternatives, model, max_iter = -1,
     d['real_regret'] = np.max(scores) - scores[best_alt_id]
     d['rational'] = rational_list
     d['ite'] = ite
+    d['method'] = first_polytope.get_method()
     return d
 
 def possibilist_elicitation(alternatives, model, confidence, t_norm = 'product',
                             max_iter = -1, inconsistency_type = 'zero',
                             rational = None, regret_limit = 10**-10,
-                            min_possibility = 0):
+                            min_possibility = 0, pruning = False, method = 'auto',
+                            ram_budget = None, spill_directory = None,
+                            max_polytopes = None, max_bytes = None, beam_rule = 'drop'):
     """
     Possibilist elicitation with CSS.
 
@@ -119,13 +137,46 @@ def possibilist_elicitation(alternatives, model, confidence, t_norm = 'product',
         If a regret limit. The default is 10**-10.
     min_possibility : float, optional
         Min possibility to consider a polytope. The default is 0.
+    pruning : bool, optional
+        Stop computing the PMR against the alternatives which cannot give a
+        MR on any polytope, see prune_alternatives (the values of these
+        pairs are then -inf). The default is False.
+    method : string, optional
+        How the PMR are computed: 'vertices', 'linprog' or 'auto' to choose
+        for each polytope, see maximize_polytope. The default is 'auto'.
+    ram_budget : integer, optional
+        Bytes of arrays of the polytopes (PMR, vertices, points) and of the
+        focal sets kept in RAM, the rest is moved to memory-mapped files (see
+        SpillStore). The default is None (all in RAM).
+    spill_directory : string, optional
+        Where the files are made. The default is None (the temporary
+        directory of the system).
+    max_polytopes : integer, optional
+        Max number of polytopes kept after each question, those with the
+        lowest possibility are removed. The default is None (no limit).
+    max_bytes : integer, optional
+        Same as max_polytopes in bytes, estimated from the PMR of each
+        polytope. The default is None (no limit).
+    beam_rule : string, optional
+        What to do with the polytopes above the limit: 'drop' them, or
+        'merge' them in one polytope of ignorance: the whole model space
+        with the answers of the most possible polytope merged (so its
+        possibility, the possibility of their union), then 1 for the next
+        answers. It is not counted in the limit. The default is 'drop'.
 
     Returns
     -------
     dict
         Elicitation information.
 
+    Raises
+    ------
+    NotImplementedError
+        If the beam rule is not known.
+
     """
+    if beam_rule not in ('drop', 'merge'):
+        raise NotImplementedError(beam_rule, 'is an unknown rule.')
     alternatives = get_pareto_efficient_alternatives(alternatives) #Get rid of non optimal solutions.
     nb_alternatives = len(alternatives)
 
@@ -137,6 +188,18 @@ def possibilist_elicitation(alternatives, model, confidence, t_norm = 'product',
 
     polytope_list = []
     polytope_list.append(first_polytope)
+    polytope_tree = PolytopeTree(first_polytope)
+    store = None if ram_budget is None else SpillStore(ram_budget, spill_directory)
+    max_polytopes = -1 if max_polytopes is None else max_polytopes
+    if max_bytes is not None:
+        #PMR, weights maximising each pair and pairs to recompute.
+        nbytes = nb_alternatives**2 * (8 + 8 + 1)
+        max_polytopes = max(1, max_bytes // nbytes) if max_polytopes == -1 else \
+            max(1, min(max_polytopes, max_bytes // nbytes))
+    ignorance_polytope = None
+    focal_sets = FocalSets(inconsistency_type)
+    discarded_possibility = 0
+    nb_discarded = 0
 
     question_strategy = CSSQuestionStrategy(alternatives)
 
@@ -158,16 +221,25 @@ def possibilist_elicitation(alternatives, model, confidence, t_norm = 'product',
     ite = 0
     start_time = time.time()
 
-    epmr = pmr_polytope(alternatives, first_polytope, model)
+    epmr = pmr_polytope(alternatives, first_polytope, model, method)
     emr =  mr_polytope(epmr)
+    possibility_list = [first_polytope.get_possibility()]
+    active = np.ones(nb_alternatives, dtype = bool) #Alternatives which can give a MR.
 
     while ite < max_iter:
 
+        candidate_alt, candidate_alt_id = question_strategy.give_candidate(emr)
+        pruned_oponents = question_strategy.get_open_oponents(candidate_alt_id) & ~active
+        if np.any(pruned_oponents):
+            #The oponent can be pruned: its PMR against the candidate is needed.
+            pmr_list = [pmr_polytope(alternatives, polytope, model, method, rows = [candidate_alt_id],
+                                     columns = pruned_oponents)
+                        for polytope in polytope_list]
+            epmr, _ = compute_epmr_emr(pmr_list, possibility_list, inconsistency_type)
+
         pmr_list = []
         possibility_list = []
-        new_polytope_list = []
 
-        candidate_alt, candidate_alt_id = question_strategy.give_candidate(emr)
         worst_alt, _ = question_strategy.give_oponent(epmr, candidate_alt_id)
         choice = get_choice_fixed(candidate_alt, worst_alt, rational[ite], model)
         best_prefered = choice['accepted']
@@ -176,55 +248,49 @@ def possibilist_elicitation(alternatives, model, confidence, t_norm = 'product',
         A_list.append(new_constraint_a)
         b_list.append(new_constraint_b)
 
+        #Only the cells the constrainst crosses are checked one by one.
+        polytope_tree.add_answer(new_constraint_a, new_constraint_b, confidence[ite], t_norm,
+                                 min_possibility)
+        polytope_list = polytope_tree.get_polytopes()
+        if ignorance_polytope is not None:
+            ignorance_polytope.add_answer(None, None, 1, t_norm, redundant = True) #On both sides.
+        if max_polytopes != -1 and len(polytope_list) > max_polytopes:
+            #Only keep the polytopes with the highest possibility.
+            order = np.argsort([-polytope.get_possibility() for polytope in polytope_list],
+                               kind = 'stable')
+            removed = [polytope_list[i] for i in order[max_polytopes:]]
+            polytope_tree.remove_polytopes({id(polytope) for polytope in removed})
+            polytope_list = polytope_tree.get_polytopes()
+            discarded_possibility = max(discarded_possibility,
+                                        max(polytope.get_possibility() for polytope in removed))
+            nb_discarded = nb_discarded + len(removed)
+            if beam_rule == 'merge' and (ignorance_polytope is None or
+                                         removed[0].get_possibility() > ignorance_polytope.get_possibility()):
+                ignorance_polytope = Polytope(None,None,constraints_a, constraints_b, bounds)
+                for answer in removed[0].get_answers():
+                    ignorance_polytope.add_answer(None, None, answer, t_norm, redundant = True)
+        if ignorance_polytope is not None:
+            polytope_list.append(ignorance_polytope)
         for polytope in polytope_list:
-
-            side = intersection_checker(polytope, new_constraint_a, new_constraint_b)
-            if side is None:
-                return None
-            '''If the new constrainst intersects with the current polytope:
-            - Create two new ones,
-            - Keep those with a suffissant possibility,
-            - Delete the original polytope'''
-            if side == 0:
-                polytope_1, polytope_2 = cut_polytope(polytope, new_constraint_a, new_constraint_b, confidence[ite], t_norm)
-                del polytope
-                if polytope_1.get_possibility() > min_possibility:
-                    new_polytope_list.append(polytope_1)
-                    pmr = pmr_polytope(alternatives, polytope_1, model)
-                    pmr_list.append(pmr)
-                    possibility_list.append(polytope_1.get_possibility())
-                else:
-                    del polytope_1
-                if polytope_2.get_possibility() > min_possibility:
-                    new_polytope_list.append(polytope_2)
-                    pmr = pmr_polytope(alternatives, polytope_2, model)
-                    pmr_list.append(pmr)
-                    possibility_list.append(polytope_2.get_possibility())
-
-                else:
-                    del polytope_2
-
-            #Else, just update the possibility.
-            else:
-                if side == 1:
-                    polytope.add_answer(new_constraint_a, new_constraint_b, 1, t_norm)
-                else:
-                    polytope.add_answer(-new_constraint_a, -new_constraint_b, 1-confidence[ite], t_norm)
-
-                if polytope.get_possibility() > min_possibility:
-                    new_polytope_list.append(polytope)
-                    pmr = pmr_polytope(alternatives, polytope, model)
-                    pmr_list.append(pmr)
-                    possibility_list.append(polytope.get_possibility())
-                else:
-                    del polytope
-
-        polytope_list = new_polytope_list
+            pmr = pmr_polytope(alternatives, polytope, model, method, columns = active) #Kept in the polytope.
+            pmr_list.append(pmr)
+            possibility_list.append(polytope.get_possibility())
+        if store is not None:
+            store.balance(polytope_list, focal_sets)
+            #The PMR moved to the files (nothing to compute again).
+            pmr_list = [pmr_polytope(alternatives, polytope, model, method, columns = active)
+                        for polytope in polytope_list]
 
         if np.max(regret) <= regret_limit :# (ite != 0 and best_emr > memr_estimated_list[ite-1]) or :
             break
 
-        epmr, emr = compute_epmr_emr(pmr_list, possibility_list, inconsistency_type)
+        if pruning is True:
+            active = prune_alternatives(alternatives, polytope_list, model, active)
+        #Only the focal sets after the first polytope changed are computed again.
+        focal_sets.set_polytopes(polytope_list, pmr_list, possibility_list)
+        epmr, emr = focal_sets.compute_epmr_emr()
+        if store is not None:
+            store.balance(polytope_list, focal_sets) #The new cumulative max.
         ite = ite+1
 
     d = {}
@@ -232,18 +298,25 @@ def possibilist_elicitation(alternatives, model, confidence, t_norm = 'product',
     d['inconsistency'] = 1-np.max(possibility_list)
     d['possibility_list'] = possibility_list
     d['polytope_list'] = polytope_list
+    d['method_list'] = [polytope.get_method() for polytope in polytope_list]
     d['best_alternative'] = best_alt_id
     d['real_regret'] = np.max(scores) - scores[best_alt_id]
     d['value_list'] = pmr_list
+    d['spilled_bytes'] = 0 if store is None else store.get_nbytes()
+    d['discarded_possibility'] = discarded_possibility
+    d['nb_discarded'] = nb_discarded
+    d['ignorance_polytope'] = ignorance_polytope
     d['A'] = np.concatenate(A_list, axis=0)
     d['b'] = np.concatenate(b_list, axis=0)
     d['ite'] = ite
     return d
 
 def get_recommendation(things_list, possibility_list, alternatives, model,
-                       inconsistency_type = 'zero', polytopes = True):
+                       inconsistency_type = 'zero', polytopes = True, method = 'auto'):
     """
     Determine the optimal recommendation according to some criterion from polytopes or values.
+    With polytopes, the maximax and maximin recommendations are also given,
+    from the same evaluation of each polytope.
 
     Parameters
     ----------
@@ -258,8 +331,12 @@ def get_recommendation(things_list, possibility_list, alternatives, model,
     inconsistency_type : string, optional
         Inconsistency in the EPMR. The default is 'zero'.
     polytopes : bool, optional
-        Do we use polytopes in things_list. The default is True.
-        
+        Do we use polytopes in things_list (the PMR kept in each polytope
+        is reused). The default is True.
+    method : string, optional
+        How the polytopes are evaluated: 'vertices', 'linprog' or 'auto',
+        see maximize_polytope. The default is 'auto'.
+
     Returns
     -------
     dict
@@ -269,12 +346,24 @@ def get_recommendation(things_list, possibility_list, alternatives, model,
     scores = model.get_model_score(alternatives)
     if polytopes is True:
         value_list = []
+        max_list = []
+        min_list = []
         for polytope in things_list:
-            value_list.append(pmr_polytope(alternatives, polytope, model))
+            evaluation = evaluate_polytope(alternatives, polytope, model, method)
+            value_list.append(evaluation['pmr'])
+            max_list.append(evaluation['max'])
+            min_list.append(evaluation['min'])
     else:
         value_list = things_list
 
-    _, epmr = compute_epmr_emr(value_list, possibility_list, inconsistency_type)
+    #All the criteria in one pass.
+    if polytopes is True:
+        criteria = compute_criteria(np.asarray(value_list), np.asarray(possibility_list),
+                                    np.asarray(max_list), np.asarray(min_list), inconsistency_type)
+    else:
+        criteria = compute_criteria(np.asarray(value_list), np.asarray(possibility_list),
+                                    inconsistency_type = inconsistency_type)
+    epmr = criteria['emr']
     _, best_alt_id, _ = minimax_regret_choice(alternatives, epmr)
     regret_real = np.max(scores) - scores[best_alt_id]
 
@@ -283,4 +372,11 @@ def get_recommendation(things_list, possibility_list, alternatives, model,
     result['real_regret'] = regret_real
     if polytopes is True:
         result['value_list'] = value_list
+        result['method_list'] = [polytope.get_method() for polytope in things_list]
+        _, best_alt_id, _ = maximax_choice(alternatives, criteria['emax'])
+        result['best_alternative_maximax'] = best_alt_id
+        result['real_regret_maximax'] = np.max(scores) - scores[best_alt_id]
+        _, best_alt_id, _ = maximin_choice(alternatives, criteria['emin'])
+        result['best_alternative_maximin'] = best_alt_id
+        result['real_regret_maximin'] = np.max(scores) - scores[best_alt_id]
     return result
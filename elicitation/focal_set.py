@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 """This module gives tools for focal sets (compute empr notably)."""
 
-from copy import deepcopy
+from bisect import bisect_left, bisect_right
 import numpy as np
+from elicitation.spill_store import is_on_file
 
 def _compute_levels(possibility_list):
     """
@@ -27,6 +28,45 @@ def _compute_levels(possibility_list):
     levels = np.sort(levels)[::-1]
     return levels
 
+def _focal_set_values(value_list, possibility_list, levels, function = np.maximum,
+                      initial = None):
+    """
+    Merge the values of the polytopes in each focal set (the polytopes with
+    a possibility at least a level): the values are merged in place in the
+    focal set of their possibility, then cumulatively from the most possible,
+    each focal set being a prefix. The values are not copied.
+
+    Parameters
+    ----------
+    value_list : list
+        Values (PMR, MR, max or min) for each polytope.
+    possibility_list : list
+        Possibility for each polytope.
+    levels : array_like
+        Levels, decreasing.
+    function : ufunc, optional
+        How to merge, np.maximum or np.minimum. The default is np.maximum.
+    initial : array_like, optional
+        Values in all the focal sets (as the model space when the answers
+        are inconsistent). The default is None (none).
+
+    Returns
+    -------
+    array_like
+        The merged values for each level but the last one.
+
+    """
+    value_list = np.asarray(value_list)
+    #The focal set of each polytope, the last level (possibility 0) is not used.
+    focal_sets = np.searchsorted(-np.asarray(levels), -np.asarray(possibility_list))
+    values = np.full((len(levels),) + value_list.shape[1:],
+                     -np.inf if function is np.maximum else np.inf)
+    if initial is not None:
+        values[0] = initial
+    function.at(values, focal_sets, value_list)
+    function.accumulate(values, axis = 0, out = values)
+    return values[0:-1]
+
 ### Minmax regret ###
 
 def compute_epmr_emr(pmr_list, possibility_list, inconsistency_type = 'ignorance'):
@@ -79,8 +119,8 @@ def _update_pmr_mr(pmr_list, possibility_list, inconsistency_type = 'ignorance')
         Updated possibility list.
 
     """
-    new_pmr_list = deepcopy(pmr_list)
-    new_possibility_list = deepcopy(possibility_list)
+    new_pmr_list = list(pmr_list) #The arrays are not changed.
+    new_possibility_list = list(possibility_list)
     if np.max(possibility_list) != 1:
         new_possibility_list.append(1)
         if inconsistency_type == 'ignorance':
@@ -112,11 +152,7 @@ def _epmr_compute(pmr_list, possibility_list, levels):
         epmr.
 
     """
-    new_pmr_list = np.zeros((len(levels) - 1, pmr_list[0].shape[0],pmr_list[0].shape[0]))
-
-    for i in range(len(levels) - 1):
-        idx_in_focal_sets = np.where(possibility_list >= levels[i])[0]
-        new_pmr_list[i] = np.max(np.asarray([pmr_list[j] for j in idx_in_focal_sets]), axis = 0)
+    new_pmr_list = _focal_set_values(pmr_list, possibility_list, levels)
     res = np.sum(new_pmr_list * (levels[0:-1] - levels[1:])[:,None,None], axis = 0)
     return res
 
@@ -139,15 +175,316 @@ def _emr_compute(mr_list, possibility_list, levels):
         emr.
 
     """
+    new_mr_list = _focal_set_values(mr_list, possibility_list, levels)
+    res = np.sum(new_mr_list * (levels[0:-1] - levels[1:])[:,None], axis = 0)
+    return res
 
-    new_mr_list = np.zeros((len(levels) - 1, mr_list[0].shape[0]))
+def compute_criteria(pmr_array, possibility_array, max_array = None, min_array = None,
+                     inconsistency_type = 'ignorance'):
+    """
+    Compute the EPMR, EMR, emax and emin from stacked arrays, the same as
+    compute_epmr_emr and compute_emax_emin. The inputs are not copied, see
+    _focal_set_values.
 
-    for i in range(len(levels) - 1):
-        idx_in_focal_sets = np.where(possibility_list >= levels[i])[0]
-        new_mr_list[i] = np.max(np.asarray([mr_list[j] for j in idx_in_focal_sets]), axis = 0)
-    res = np.sum(new_mr_list * (levels[0:-1] - levels[1:])[:,None], axis = 0)
+    Parameters
+    ----------
+    pmr_array : array_like
+        3-D array, the PMR of each polytope.
+    possibility_array : array_like
+        1-D array, the possibility of each polytope.
+    max_array : array_like, optional
+        2-D array, the max of each alternative on each polytope. The default
+        is None (no emax).
+    min_array : array_like, optional
+        2-D array, the min of each alternative on each polytope. The default
+        is None (no emin).
+    inconsistency_type : string, optional
+        How uncertainty is handeled. The default is 'ignorance'.
+
+    Returns
+    -------
+    dict
+        EPMR ('epmr'), EMR ('emr'), emax ('emax') and emin ('emin').
+
+    Raises
+    ------
+    NotImplementedError
+        If the inconsistency type is not known.
+
+    """
+    if inconsistency_type not in ('ignorance', 'zero'):
+        raise NotImplementedError(inconsistency_type, 'is an unknown rule.')
+    possibility_array = np.asarray(possibility_array)
+    inconsistent = np.max(possibility_array) != 1
+    levels = _compute_levels(np.append(possibility_array, 1) if inconsistent else possibility_array)
+    widths = levels[0:-1] - levels[1:]
+    res = {}
+    new_pmr_array = _focal_set_values(pmr_array, possibility_array, levels, np.maximum,
+                                      _ignorance_values(pmr_array, np.maximum, inconsistent,
+                                                        inconsistency_type))
+    res['epmr'] = np.sum(new_pmr_array * widths[:,None,None], axis = 0)
+    res['emr'] = np.sum(np.max(new_pmr_array, axis = 2) * widths[:,None], axis = 0)
+    if max_array is not None:
+        new_max_array = _focal_set_values(max_array, possibility_array, levels, np.maximum,
+                                          _ignorance_values(max_array, np.maximum, inconsistent,
+                                                            inconsistency_type))
+        res['emax'] = np.sum(new_max_array * widths[:,None], axis = 0)
+    if min_array is not None:
+        new_min_array = _focal_set_values(min_array, possibility_array, levels, np.minimum,
+                                          _ignorance_values(min_array, np.minimum, inconsistent,
+                                                            inconsistency_type))
+        res['emin'] = np.sum(new_min_array * widths[:,None], axis = 0)
     return res
 
+def _ignorance_values(value_array, function, inconsistent, inconsistency_type):
+    """
+    Values of the model space, with a possibility of 1 (first in all the
+    focal sets) when the answers are inconsistent.
+
+    Parameters
+    ----------
+    value_array : array_like
+        Values (PMR, max or min) of each polytope.
+    function : ufunc
+        How to merge, np.maximum or np.minimum.
+    inconsistent : bool
+        True if no polytope has a possibility of 1.
+    inconsistency_type : string
+        How uncertainty is handeled.
+
+    Returns
+    -------
+    array_like
+        The values (None if consistent).
+
+    """
+    if not inconsistent:
+        return None
+    if inconsistency_type == 'ignorance':
+        return function.reduce(value_array, axis = 0)
+    #Equivalent to Guillot min model max(0, regret)
+    return np.zeros(np.shape(value_array)[1:])
+
+class FocalSets:
+    """
+    The PMR of the polytopes kept from one iteration to the next, sorted
+    from the most possible with their cumulative max (the PMR of each focal
+    set). When some polytopes change, only the cumulative max after the
+    first of them is computed again. The EPMR and EMR are the same as with
+    compute_epmr_emr.
+    """
+
+    def __init__(self, inconsistency_type = 'ignorance'):
+        """
+        Parameters
+        ----------
+        inconsistency_type : string, optional
+            How uncertainty is handeled. The default is 'ignorance'.
+
+        Raises
+        ------
+        NotImplementedError
+            If the inconsistency type is not known.
+        """
+        if inconsistency_type not in ('ignorance', 'zero'):
+            raise NotImplementedError(inconsistency_type, 'is an unknown rule.')
+        self._inconsistency_type = inconsistency_type
+        self._keys = []
+        self._opposite_possibilities = [] #Increasing.
+        self._pmr_list = []
+        self._cumulative_pmr_list = []
+        self._possibilities = {}
+        self._first_changed = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def insert(self, key, pmr, possibility):
+        """
+        Add a polytope.
+
+        Parameters
+        ----------
+        key : object
+            What identifies the polytope (the polytope itself).
+        pmr : array_like
+            Its PMR.
+        possibility : float
+            Its possibility.
+
+        Returns
+        -------
+        None.
+
+        """
+        i = bisect_right(self._opposite_possibilities, -possibility)
+        self._keys.insert(i, key)
+        self._opposite_possibilities.insert(i, -possibility)
+        self._pmr_list.insert(i, pmr)
+        self._cumulative_pmr_list.insert(i, None)
+        self._possibilities[id(key)] = possibility
+        self._first_changed = min(self._first_changed, i)
+
+    def remove(self, key):
+        """
+        Remove a polytope.
+
+        Parameters
+        ----------
+        key : object
+            What identifies the polytope.
+
+        Returns
+        -------
+        None.
+
+        """
+        i = self._index(key)
+        del self._possibilities[id(key)]
+        del self._keys[i]
+        del self._opposite_possibilities[i]
+        del self._pmr_list[i]
+        del self._cumulative_pmr_list[i]
+        self._first_changed = min(self._first_changed, i)
+
+    def update(self, key, pmr, possibility):
+        """
+        Change the PMR or the possibility of a polytope.
+
+        Parameters
+        ----------
+        key : object
+            What identifies the polytope.
+        pmr : array_like
+            Its PMR.
+        possibility : float
+            Its possibility.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.remove(key)
+        self.insert(key, pmr, possibility)
+
+    def set_polytopes(self, key_list, pmr_list, possibility_list):
+        """
+        Set all the polytopes: those missing are removed, the others added or
+        updated if their PMR (a new array with other values) or possibility
+        changed.
+
+        Parameters
+        ----------
+        key_list : list
+            What identifies each polytope.
+        pmr_list : list
+            PMR for each polytope.
+        possibility_list : list
+            Possibility for each polytope.
+
+        Returns
+        -------
+        None.
+
+        """
+        known = {id(key): (pmr, self._possibilities[id(key)]) for key, pmr
+                 in zip(self._keys, self._pmr_list)}
+        kept = {id(key) for key in key_list}
+        for key in [key for key in self._keys if id(key) not in kept]:
+            self.remove(key)
+        for key, pmr, possibility in zip(key_list, pmr_list, possibility_list):
+            if id(key) not in known:
+                self.insert(key, pmr, possibility)
+            elif known[id(key)][1] != possibility or \
+                (known[id(key)][0] is not pmr and not np.array_equal(known[id(key)][0], pmr)):
+                self.update(key, pmr, possibility)
+            elif known[id(key)][0] is not pmr:
+                #The same values (as moved to a file), the focal sets stay the same.
+                self._pmr_list[self._index(key)] = pmr
+
+    def get_nbytes(self):
+        """
+        Get the bytes of the cumulative max kept in RAM (not on a file), the
+        PMR are those of the polytopes.
+        """
+        return sum(cumulative.nbytes for cumulative, pmr
+                   in zip(self._cumulative_pmr_list, self._pmr_list)
+                   if cumulative is not None and cumulative is not pmr and not is_on_file(cumulative))
+
+    def spill(self, store, nbytes):
+        """
+        Move cumulative max kept in RAM to files, from the most possible
+        polytope (the last computed again when the polytopes change).
+
+        Parameters
+        ----------
+        store : SpillStore
+            Where the arrays are moved.
+        nbytes : integer
+            Bytes to move at least (if there are).
+
+        Returns
+        -------
+        integer
+            The bytes moved.
+
+        """
+        moved = 0
+        for i, (cumulative, pmr) in enumerate(zip(self._cumulative_pmr_list, self._pmr_list)):
+            if moved >= nbytes:
+                break
+            if cumulative is not None and cumulative is not pmr and not is_on_file(cumulative):
+                self._cumulative_pmr_list[i] = store.to_file(cumulative)
+                moved = moved + cumulative.nbytes
+        return moved
+
+    def _index(self, key):
+        """
+        Find where a polytope is.
+        """
+        i = bisect_left(self._opposite_possibilities, -self._possibilities[id(key)])
+        while self._keys[i] is not key:
+            i = i + 1
+        return i
+
+    def compute_epmr_emr(self):
+        """
+        Compute the EPMR and EMR.
+
+        Returns
+        -------
+        epmr : float
+            epmr.
+        emr : float
+            emr.
+
+        """
+        for i in range(self._first_changed, len(self._keys)):
+            self._cumulative_pmr_list[i] = self._pmr_list[i] if i == 0 else \
+                np.maximum(self._cumulative_pmr_list[i-1], self._pmr_list[i])
+        self._first_changed = len(self._keys)
+        possibility_list = -np.asarray(self._opposite_possibilities)
+        inconsistent = np.max(possibility_list) != 1
+        levels = _compute_levels(list(possibility_list) + ([1] if inconsistent else []))
+        nb_in_focal_sets = np.searchsorted(self._opposite_possibilities, -levels[0:-1],
+                                           side = 'right')
+        if not inconsistent:
+            new_pmr_list = [self._cumulative_pmr_list[nb - 1] for nb in nb_in_focal_sets]
+        else:
+            #The model space with a possibility of 1, first in all the focal sets.
+            if self._inconsistency_type == 'ignorance':
+                pmr = self._cumulative_pmr_list[-1]
+            else:
+                pmr = np.zeros(self._pmr_list[0].shape)
+            new_pmr_list = [pmr if nb == 0 else np.maximum(pmr, self._cumulative_pmr_list[nb - 1])
+                            for nb in nb_in_focal_sets]
+        new_pmr_list = np.asarray(new_pmr_list)
+        new_mr_list = np.max(new_pmr_list, axis = 2)
+        epmr = np.sum(new_pmr_list * (levels[0:-1] - levels[1:])[:,None,None], axis = 0)
+        emr = np.sum(new_mr_list * (levels[0:-1] - levels[1:])[:,None], axis = 0)
+        return epmr, emr
+
 ### Maximax or Maximin ###
 
 def compute_emax_emin(max_list, possibility_list, criterion = 'maximax',
@@ -201,8 +538,8 @@ def _update_max_min(max_list, possibility_list, criterion = 'maximax',
         Updated possibility list.
 
     """
-    new_max_list = deepcopy(max_list)
-    new_possibility_list = deepcopy(possibility_list)
+    new_max_list = list(max_list) #The arrays are not changed.
+    new_possibility_list = list(possibility_list)
     if np.max(possibility_list) != 1:
         new_possibility_list.append(1)
         if inconsistency_type == 'ignorance':
@@ -238,15 +575,17 @@ def _emax_emin_compute(max_list, possibility_list, levels, criterion = 'maximax'
     float
         emax (or emin).
 
-    """
+    Raises
+    ------
+    ValueError
+        If the criterion is not 'maximax' or 'maximin'.
 
-    new_max_list = np.zeros((len(levels) - 1, max_list[0].shape[0]))
-
-    for i in range(len(levels) - 1):
-        idx_in_focal_sets = np.where(possibility_list >= levels[i])[0]
-        if criterion == 'maximax':
-            new_max_list[i] = np.max(np.asarray([max_list[j] for j in idx_in_focal_sets]), axis = 0)
-        elif criterion == "maximin":
-            new_max_list[i] = np.min(np.asarray([max_list[j] for j in idx_in_focal_sets]), axis = 0)
+    """
+    if criterion == 'maximax':
+        new_max_list = _focal_set_values(max_list, possibility_list, levels, np.maximum)
+    elif criterion == "maximin":
+        new_max_list = _focal_set_values(max_list, possibility_list, levels, np.minimum)
+    else:
+        raise ValueError(criterion, "is an unknown criterion, 'maximax' or 'maximin' expected.")
     res = np.sum(new_max_list * (levels[0:-1] - levels[1:])[:,None], axis = 0)
     return res
@@ -3,72 +3,71 @@
 
 import numpy as np
 
-def tnorm(information, fusion_rule = "product"):
+def tnorm(information, fusion_rule = "product", axis = None):
     """T-norm of pieces of information.
 
     Parameters
     ----------
-    information : float
+    information : array_like
         Pieces of information to fuse.
-    fusion_rule : array_like
+    fusion_rule : string
         The T-norm used for merging information.
-        
+    axis : integer, optional
+        The axis along which the pieces are fused. The default is None (all).
+
     Returns
     -------
-    float
-        The T-norm of the pieces.
-        
+    float or array_like
+        The T-norm of the pieces (an array if axis is given).
+
     Raises
     ------
     NotImplementedError
         If the rule given during initialisation is not known.
     """
-    if np.min(information) == 0: #If one zero: stop.
-        return 0
+    information = np.asarray(information, dtype = float)
     if fusion_rule == 'minimum':
-        return np.min(information)
-    if fusion_rule == 'product':
-        return np.product(information)
-    if fusion_rule == 'lukasiewicz':
-        luk = 1
-        for info in information:
-            luk = np.maximum(0, luk + info - 1)
-        return luk
-    raise NotImplementedError(fusion_rule, 'is an unknown rule.')
+        res = np.min(information, axis = axis)
+    elif fusion_rule == 'product':
+        res = np.prod(information, axis = axis)
+    elif fusion_rule == 'lukasiewicz':
+        nb_pieces = information.size if axis is None else information.shape[axis]
+        res = np.maximum(0, np.sum(information, axis = axis) - (nb_pieces - 1))
+    else:
+        raise NotImplementedError(fusion_rule, 'is an unknown rule.')
+    res = np.where(np.min(information, axis = axis) == 0, 0, res) #If one zero: zero.
+    return res[()] if res.ndim == 0 else res
 
-def tconorm(information, fusion_rule = "probabilistic"):
+def tconorm(information, fusion_rule = "probabilistic", axis = None):
     """T-Conorm of pieces of information.
 
     Parameters
     ----------
-    information : float
+    information : array_like
         Pieces of information to fuse.
-    fusion_rule : array_like
+    fusion_rule : string
         The T-conorm used for merging information.
-        
+    axis : integer, optional
+        The axis along which the pieces are fused. The default is None (all).
+
     Returns
     -------
-    float
-        The T-Conorm of the pieces.
-        
+    float or array_like
+        The T-Conorm of the pieces (an array if axis is given).
+
     Raises
     ------
     NotImplementedError
         If the rule given during initialisation is not known.
     """
-    if np.max(information) == 1:  #If one one: stop.
-        return 1
+    information = np.asarray(information, dtype = float)
     if fusion_rule == 'maximum':
-        return np.max(information)
-    if fusion_rule == 'probabilistic':
-        prob = 0
-        for info in information:
-            prob = prob + info - prob * info
-        return prob
-    if fusion_rule == 'bounded':
-        bound = 0
-        for info in information:
-            bound = np.minimum(1, bound + info)
-        return bound
-    raise NotImplementedError(fusion_rule, 'is an unknown rule.')
-    
\ No newline at end of file
+        res = np.max(information, axis = axis)
+    elif fusion_rule == 'probabilistic':
+        res = 1 - np.prod(1 - information, axis = axis)
+    elif fusion_rule == 'bounded':
+        res = np.minimum(1, np.sum(information, axis = axis))
+    else:
+        raise NotImplementedError(fusion_rule, 'is an unknown rule.')
+    res = np.where(np.max(information, axis = axis) == 1, 1, res) #If one one: one.
+    return res[()] if res.ndim == 0 else res
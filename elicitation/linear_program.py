@@ -0,0 +1,652 @@
+# -*- coding: utf-8 -*-
+"""This module solves the linear programs over a polytope, with several backends:
+- 'linprog': scipy linprog, every LP is solved from scratch,
+- 'highs': one persistent HiGHS model (needs highspy), warm started,
+- 'numpy': the vertices of the region, only for small model spaces."""
+
+import itertools
+from math import comb
+import numpy as np
+from scipy.optimize import linprog
+try:
+    import highspy
+except ImportError: #The 'highs' backend is then not available.
+    highspy = None
+
+NUMPY_MAX_PARAMETERS = 6
+MAX_VERTEX_SYSTEMS = 10**6 #Above, the vertices are not enumerated (an LP is used).
+_backend = 'highs' if highspy is not None else 'linprog'
+
+def set_backend(backend):
+    """
+    Choose the backend used for the new LPs.
+
+    Parameters
+    ----------
+    backend : string
+        'linprog', 'highs' or 'numpy'.
+
+    Returns
+    -------
+    None.
+
+    Raises
+    ------
+    NotImplementedError
+        If the backend is not known.
+    ImportError
+        If highspy is missing for the 'highs' backend.
+    """
+    global _backend
+    if backend not in BACKENDS:
+        raise NotImplementedError(backend, 'is an unknown backend.')
+    if backend == 'highs' and highspy is None:
+        raise ImportError('The highs backend needs highspy.')
+    _backend = backend
+
+def get_backend():
+    """
+    Get the backend used for the new LPs.
+    """
+    return _backend
+
+def make_linear_program(A_ub, b_ub, A_eq, b_eq, bounds, backend = None):
+    """
+    Build the LPs over a region with a backend.
+
+    Parameters
+    ----------
+    A_ub : array_like
+        2-D array of values representing A for the constrainst Ax <= b (can be None).
+    b_ub : array_like
+        1-D array of values representing b for the constrainst Ax <= b (can be None).
+    A_eq : array_like
+        2-D array of values representing A for the constrainst Ax = b.
+    b_eq : array_like
+        1-D array of values representing b for the constrainst Ax = b.
+    bounds : sequence
+        Minimum and maximum values for each parameters of the model space.
+    backend : string, optional
+        The backend, the one chosen with set_backend if None. 'numpy' falls
+        back to a solver beyond NUMPY_MAX_PARAMETERS parameters. The default is None.
+
+    Returns
+    -------
+    LinearProgram
+        The LPs.
+
+    Raises
+    ------
+    NotImplementedError
+        If the backend is not known.
+    """
+    if backend is None:
+        backend = _backend
+    if backend not in BACKENDS:
+        raise NotImplementedError(backend, 'is an unknown backend.')
+    if backend == 'numpy' and np.atleast_2d(A_eq).shape[1] > NUMPY_MAX_PARAMETERS:
+        backend = 'highs' if highspy is not None else 'linprog'
+    return BACKENDS[backend](A_ub, b_ub, A_eq, b_eq, bounds)
+
+class LinearProgram():
+    """
+    Linear programs sharing the same feasible region, which can only shrink
+    by adding constrainsts.
+    """
+
+    def __init__(self, A_ub, b_ub, A_eq, b_eq, bounds):
+        """
+        Parameters
+        ----------
+        A_ub : array_like
+            2-D array of values representing A for the constrainst Ax <= b (can be None).
+        b_ub : array_like
+            1-D array of values representing b for the constrainst Ax <= b (can be None).
+        A_eq : array_like
+            2-D array of values representing A for the constrainst Ax = b.
+        b_eq : array_like
+            1-D array of values representing b for the constrainst Ax = b.
+        bounds : sequence
+            Minimum and maximum values for each parameters of the model space.
+        """
+        self._A_eq = np.atleast_2d(np.asarray(A_eq, dtype = float))
+        self._b_eq = np.ravel(np.asarray(b_eq, dtype = float))
+        self._nb_parameters = self._A_eq.shape[1]
+        if A_ub is None or len(A_ub) == 0:
+            self._A_ub = np.empty((0, self._nb_parameters))
+            self._b_ub = np.empty(0)
+        else:
+            self._A_ub = np.atleast_2d(np.asarray(A_ub, dtype = float))
+            self._b_ub = np.ravel(np.asarray(b_ub, dtype = float))
+        self._bounds = bounds
+
+    def add_constraint(self, constraint_a, constraint_b):
+        """
+        Add a constrainst Ax <= b.
+
+        Parameters
+        ----------
+        constraint_a : array_like
+            A (Ax < b).
+        constraint_b : array_like
+            b (Ax < b).
+
+        Returns
+        -------
+        None.
+
+        """
+        constraint_a = np.atleast_2d(np.asarray(constraint_a, dtype = float))
+        constraint_b = np.ravel(np.asarray(constraint_b, dtype = float))
+        self._A_ub = np.vstack((self._A_ub, constraint_a))
+        self._b_ub = np.concatenate((self._b_ub, constraint_b))
+
+    def remove_constraints(self, constraint_a, constraint_b):
+        """
+        Remove constrainsts Ax <= b (the rows equal to one of them).
+
+        Parameters
+        ----------
+        constraint_a : array_like
+            A (Ax < b), one row per constrainst.
+        constraint_b : array_like
+            b (Ax < b).
+
+        Returns
+        -------
+        array_like
+            The rows removed.
+
+        """
+        constraint_a = np.atleast_2d(np.asarray(constraint_a, dtype = float))
+        constraint_b = np.ravel(np.asarray(constraint_b, dtype = float))
+        removed = np.any(np.all(self._A_ub[:,np.newaxis,:] == constraint_a[np.newaxis,:,:], axis = 2) &
+                         (self._b_ub[:,np.newaxis] == constraint_b[np.newaxis,:]), axis = 1)
+        self._A_ub = self._A_ub[~removed]
+        self._b_ub = self._b_ub[~removed]
+        return np.nonzero(removed)[0]
+
+    def remove_redundant(self, tolerance = 10**-9):
+        """
+        Remove the constrainsts Ax <= b which do not change the region: the
+        max of Ax over the region without them is at most b. Each backend
+        finds them with its own solver: one LP per constrainst, those already
+        removed left out of the next LPs ('linprog' and 'highs'), or the
+        constrainsts not defining a facet, from the vertices ('numpy').
+
+        Parameters
+        ----------
+        tolerance : float, optional
+            Tolerance on b. The default is 10**-9.
+
+        Returns
+        -------
+        array_like
+            A (Ax < b) of the constrainsts removed, one row per constrainst.
+        array_like
+            b (Ax < b) of the constrainsts removed.
+
+        """
+        redundant = self._find_redundant(tolerance)
+        constraint_a, constraint_b = self._A_ub[redundant], self._b_ub[redundant]
+        if len(constraint_b) != 0:
+            self.remove_constraints(constraint_a, constraint_b)
+        return constraint_a, constraint_b
+
+    def _find_redundant(self, tolerance):
+        """
+        Find the redundant constrainsts, see remove_redundant.
+
+        Parameters
+        ----------
+        tolerance : float
+            Tolerance on b.
+
+        Returns
+        -------
+        array_like
+            1-D array of booleans, for each constrainst Ax <= b.
+
+        """
+        raise NotImplementedError('_find_redundant is not defined for', self.__class__.__name__)
+
+    def minimize(self, c):
+        """
+        Minimise c.x over the region.
+
+        Parameters
+        ----------
+        c : array_like
+            The objective.
+
+        Returns
+        -------
+        float
+            The optimum (None if the region is empty).
+        array_like
+            The optimal x (None if the region is empty).
+
+        """
+        raise NotImplementedError('minimize is not defined for', self.__class__.__name__)
+
+    def minimize_all(self, objectives):
+        """
+        Minimise over the region each objective of a matrix. Nothing is
+        solved again once the region is known to be empty.
+
+        Parameters
+        ----------
+        objectives : array_like
+            2-D array, one objective per row.
+
+        Returns
+        -------
+        array_like
+            The optimum of each objective (nan if the region is empty).
+        array_like
+            2-D array, the optimal x of each objective (nan if the region is empty).
+
+        """
+        objectives = np.atleast_2d(objectives)
+        optima = np.full(len(objectives), np.nan)
+        points = np.full((len(objectives), self._nb_parameters), np.nan)
+        for k, objective in enumerate(objectives):
+            fun, point = self.minimize(objective)
+            if fun is None:
+                break
+            optima[k] = fun
+            points[k] = point
+        return optima, points
+
+    def find_point(self, constraint_a = None, constraint_b = None):
+        """
+        Find a point of the region, possibly restricted by more constrainsts
+        Ax <= b which are not kept.
+
+        Parameters
+        ----------
+        constraint_a : array_like, optional
+            A (Ax < b), one row per constrainst. The default is None.
+        constraint_b : array_like, optional
+            b (Ax < b). The default is None.
+
+        Returns
+        -------
+        array_like
+            A point of the region (None if it is empty).
+
+        """
+        raise NotImplementedError('find_point is not defined for', self.__class__.__name__)
+
+class LinprogLinearProgram(LinearProgram):
+    """
+    Every LP is solved from scratch by scipy linprog.
+    """
+
+    def minimize(self, c):
+        linprog_res = linprog(np.ravel(c), self._A_ub if len(self._b_ub) != 0 else None,
+                              self._b_ub if len(self._b_ub) != 0 else None,
+                              self._A_eq, self._b_eq, self._bounds,
+                              method = 'highs')
+        return linprog_res.fun, linprog_res.x
+
+    def _find_redundant(self, tolerance):
+        redundant = np.zeros(len(self._b_ub), dtype = bool)
+        for k in range(0, len(self._b_ub)):
+            others = ~redundant
+            others[k] = False
+            linprog_res = linprog(-self._A_ub[k], self._A_ub[others] if np.any(others) else None,
+                                  self._b_ub[others] if np.any(others) else None,
+                                  self._A_eq, self._b_eq, self._bounds,
+                                  method = 'highs')
+            redundant[k] = linprog_res.x is not None and -linprog_res.fun <= self._b_ub[k] + tolerance
+        return redundant
+
+    def find_point(self, constraint_a = None, constraint_b = None):
+        if constraint_a is None:
+            return self.minimize(np.zeros(self._nb_parameters))[1]
+        linprog_res = linprog(np.zeros(self._nb_parameters),
+                              np.vstack((np.atleast_2d(constraint_a), self._A_ub)),
+                              np.concatenate((np.ravel(constraint_b), self._b_ub)),
+                              self._A_eq, self._b_eq, self._bounds,
+                              method = 'highs')
+        return linprog_res.x
+
+class HighsLinearProgram(LinearProgram):
+    """
+    One HiGHS model is kept between two solves: changing the objective or
+    adding a constrainst starts from the previous basis. A copy (of a parent
+    polytope for a child polytope) also starts from the basis of the original.
+    """
+
+    def __init__(self, A_ub, b_ub, A_eq, b_eq, bounds):
+        super().__init__(A_ub, b_ub, A_eq, b_eq, bounds)
+        self._solver = None
+
+    def add_constraint(self, constraint_a, constraint_b):
+        super().add_constraint(constraint_a, constraint_b)
+        if self._solver is not None:
+            constraint_b = np.ravel(np.asarray(constraint_b, dtype = float))
+            self._add_rows(self._solver, np.atleast_2d(np.asarray(constraint_a, dtype = float)),
+                           np.full(len(constraint_b), -highspy.kHighsInf), constraint_b)
+
+    def remove_constraints(self, constraint_a, constraint_b):
+        removed = super().remove_constraints(constraint_a, constraint_b)
+        if self._solver is not None and len(removed) != 0:
+            self._solver.deleteRows(len(removed), (removed + len(self._b_eq)).astype(np.int32))
+        return removed
+
+    def _find_redundant(self, tolerance):
+        #Each constrainst is freed in the solver, which keeps its basis. The
+        #redundant ones stay free until deleted by remove_redundant.
+        solver = self._get_solver()
+        nb_equalities = len(self._b_eq)
+        redundant = np.zeros(len(self._b_ub), dtype = bool)
+        for k in range(0, len(self._b_ub)):
+            solver.changeRowBounds(nb_equalities + k, -highspy.kHighsInf, highspy.kHighsInf)
+            value, point = self.minimize(-self._A_ub[k])
+            redundant[k] = point is not None and -value <= self._b_ub[k] + tolerance
+            if not redundant[k]:
+                solver.changeRowBounds(nb_equalities + k, -highspy.kHighsInf, self._b_ub[k])
+        return redundant
+
+    def minimize(self, c):
+        solver = self._get_solver()
+        solver.changeColsCost(self._nb_parameters, np.arange(0, self._nb_parameters, dtype = np.int32),
+                              np.asarray(c, dtype = float).ravel())
+        solver.run()
+        if solver.getModelStatus() != highspy.HighsModelStatus.kOptimal:
+            return None, None
+        return solver.getInfo().objective_function_value, np.asarray(solver.getSolution().col_value)
+
+    def find_point(self, constraint_a = None, constraint_b = None):
+        if constraint_a is None:
+            return self.minimize(np.zeros(self._nb_parameters))[1]
+        solver = self._get_solver()
+        nb_rows = solver.getNumRow()
+        constraint_b = np.ravel(np.asarray(constraint_b, dtype = float))
+        self._add_rows(solver, np.atleast_2d(np.asarray(constraint_a, dtype = float)),
+                       np.full(len(constraint_b), -highspy.kHighsInf), constraint_b)
+        point = self.minimize(np.zeros(self._nb_parameters))[1]
+        solver.deleteRows(len(constraint_b), np.arange(nb_rows, nb_rows + len(constraint_b),
+                                                       dtype = np.int32))
+        return point
+
+    def _get_solver(self):
+        """
+        Get the solver, built the first time.
+        """
+        if self._solver is None:
+            solver = highspy.Highs()
+            solver.setOptionValue('output_flag', False)
+            lower = np.asarray([-highspy.kHighsInf if bound[0] is None else bound[0]
+                                for bound in self._bounds], dtype = float)
+            upper = np.asarray([highspy.kHighsInf if bound[1] is None else bound[1]
+                                for bound in self._bounds], dtype = float)
+            solver.addVars(self._nb_parameters, lower, upper)
+            self._add_rows(solver, self._A_eq, self._b_eq, self._b_eq)
+            self._add_rows(solver, self._A_ub, np.full(len(self._b_ub), -highspy.kHighsInf),
+                           self._b_ub)
+            self._solver = solver
+        return self._solver
+
+    @staticmethod
+    def _add_rows(solver, rows_a, lower, upper):
+        """
+        Add dense rows lower <= Ax <= upper to a solver.
+        """
+        nb_rows, nb_cols = rows_a.shape
+        if nb_rows == 0:
+            return
+        solver.addRows(nb_rows, lower, upper, nb_rows * nb_cols,
+                       np.arange(0, nb_rows * nb_cols, nb_cols, dtype = np.int32),
+                       np.tile(np.arange(0, nb_cols, dtype = np.int32), nb_rows),
+                       np.ravel(rows_a))
+
+    def __deepcopy__(self, memo):
+        """
+        Copy the LP, the solver of the copy starts from the current basis.
+        """
+        new = HighsLinearProgram(self._A_ub.copy(), self._b_ub.copy(), self._A_eq, self._b_eq,
+                                 self._bounds)
+        if self._solver is not None:
+            solver = highspy.Highs()
+            solver.setOptionValue('output_flag', False)
+            solver.passModel(self._solver.getLp())
+            solver.setBasis(self._solver.getBasis())
+            new._solver = solver
+        return new
+
+    def __getstate__(self):
+        """
+        The solver cannot be pickled: it is built again when needed.
+        """
+        state = self.__dict__.copy()
+        state['_solver'] = None
+        return state
+
+class NumpyLinearProgram(LinearProgram):
+    """
+    The LPs are solved on the vertices of the region (computed again when a
+    constrainst is added), without any solver.
+    """
+
+    def __init__(self, A_ub, b_ub, A_eq, b_eq, bounds):
+        super().__init__(A_ub, b_ub, A_eq, b_eq, bounds)
+        self._vertices = None
+
+    def add_constraint(self, constraint_a, constraint_b):
+        super().add_constraint(constraint_a, constraint_b)
+        self._vertices = None
+
+    def remove_constraints(self, constraint_a, constraint_b):
+        removed = super().remove_constraints(constraint_a, constraint_b)
+        if len(removed) != 0:
+            self._vertices = None
+        return removed
+
+    def get_vertices(self):
+        """
+        Get the vertices of the region.
+        """
+        if self._vertices is None:
+            self._vertices = compute_vertices(self._A_ub, self._b_ub, self._A_eq, self._b_eq,
+                                              self._bounds)
+        return self._vertices
+
+    def minimize(self, c):
+        optima, points = self.minimize_all(c)
+        if np.isnan(optima[0]):
+            return None, None
+        return optima[0], points[0]
+
+    def minimize_all(self, objectives):
+        objectives = np.atleast_2d(objectives)
+        vertices = self.get_vertices()
+        if len(vertices) == 0:
+            return (np.full(len(objectives), np.nan),
+                    np.full((len(objectives), self._nb_parameters), np.nan))
+        scores = vertices @ objectives.T
+        argmin = np.argmin(scores, axis = 0)
+        return scores[argmin, np.arange(0, len(objectives))], vertices[argmin]
+
+    def _find_redundant(self, tolerance):
+        #A constrainst not defining a facet does not change the region.
+        return find_redundant_from_vertices(self.get_vertices(), self._A_ub, self._b_ub,
+                                            self._A_eq, tolerance)
+
+    def find_point(self, constraint_a = None, constraint_b = None):
+        vertices = self.get_vertices()
+        if len(vertices) == 0:
+            return None
+        if constraint_a is None:
+            return vertices[0]
+        constraint_a = np.atleast_2d(constraint_a)
+        if len(constraint_a) > 1:
+            vertices = compute_vertices(np.vstack((self._A_ub, constraint_a)),
+                                        np.concatenate((self._b_ub, np.ravel(constraint_b))),
+                                        self._A_eq, self._b_eq, self._bounds)
+            return vertices[0] if len(vertices) != 0 else None
+        #The min of Ax on the region is reached on a vertex.
+        values = vertices @ np.ravel(constraint_a)
+        argmin = np.argmin(values)
+        if values[argmin] > np.ravel(constraint_b)[0] + 10**-9:
+            return None
+        return vertices[argmin]
+
+BACKENDS = {'linprog': LinprogLinearProgram,
+            'highs': HighsLinearProgram,
+            'numpy': NumpyLinearProgram}
+
+def find_redundant_from_vertices(vertices, A_ub, b_ub, A_eq, tolerance = 10**-9):
+    """
+    Find the constrainsts Ax <= b not defining a facet of a polytope from its
+    vertices: a facet has as many affinely independent vertices on it as the
+    dimension of the polytope. None is found if the polytope is flat.
+
+    Parameters
+    ----------
+    vertices : array_like
+        2-D array, the vertices of the polytope, one per row.
+    A_ub : array_like
+        A (Ax < b), one row per constrainst.
+    b_ub : array_like
+        b (Ax < b).
+    A_eq : array_like
+        A_eq.
+    tolerance : float, optional
+        Tolerance to be on a constrainst. The default is 10**-9.
+
+    Returns
+    -------
+    array_like
+        1-D array of booleans, for each constrainst.
+
+    """
+    redundant = np.zeros(len(b_ub), dtype = bool)
+    if len(vertices) < 2:
+        return redundant
+    dimension = vertices.shape[1] - np.linalg.matrix_rank(np.atleast_2d(A_eq))
+    if np.linalg.matrix_rank(vertices[1:] - vertices[0]) < dimension:
+        return redundant
+    tight = np.abs(vertices @ A_ub.T - b_ub) <= tolerance
+    for k in range(0, len(b_ub)):
+        on_facet = vertices[tight[:,k]]
+        redundant[k] = len(on_facet) < dimension or \
+            np.linalg.matrix_rank(on_facet[1:] - on_facet[0]) < dimension - 1
+    return redundant
+
+def bounds_as_constrainsts(bounds):
+    """
+    Write bounds as constrainsts Ax <= b.
+
+    Parameters
+    ----------
+    bounds : sequence
+        Minimum and maximum values for each parameter (None if no limit).
+
+    Returns
+    -------
+    array_like
+        A (Ax < b).
+    array_like
+        b (Ax < b).
+
+    """
+    p = len(bounds)
+    rows_a = []
+    rows_b = []
+    for k, (low, high) in enumerate(bounds):
+        if low is not None:
+            rows_a.append(-np.eye(p)[k])
+            rows_b.append(-low)
+        if high is not None:
+            rows_a.append(np.eye(p)[k])
+            rows_b.append(high)
+    return np.asarray(rows_a).reshape(-1, p), np.asarray(rows_b, dtype = float)
+
+def count_vertex_systems(nb_parameters, nb_equalities, nb_inequalities):
+    """
+    Number of systems solved by compute_vertices: one for each choice of
+    active constrainsts.
+
+    Parameters
+    ----------
+    nb_parameters : integer
+        Number of parameters.
+    nb_equalities : integer
+        Number of equalities.
+    nb_inequalities : integer
+        Number of constrainsts Ax <= b, bounds included.
+
+    Returns
+    -------
+    integer
+        The number of systems.
+
+    """
+    return comb(nb_inequalities, max(nb_parameters - nb_equalities, 0))
+
+def compute_vertices(A_ub, b_ub, A_eq, b_eq, bounds, tolerance = 10**-9, chunk_size = 2**14):
+    """
+    Enumerate the vertices of a polytope. Each vertex is the solution of a
+    system where all the equalities and enough inequalities are active, so it
+    is only suited to small model spaces (see count_vertex_systems). The
+    systems are solved by chunks to bound the memory.
+
+    Parameters
+    ----------
+    A_ub : array_like
+        A_ub (can be None).
+    b_ub : array_like
+        b_ub (can be None).
+    A_eq : array_like
+        A_eq.
+    b_eq : array_like
+        b_eq.
+    bounds : sequence
+        bounds.
+    tolerance : float, optional
+        Tolerance on the constrainsts. The default is 10**-9.
+    chunk_size : integer, optional
+        Number of systems solved at once. The default is 2**14.
+
+    Returns
+    -------
+    array_like
+        2-D array, one vertex per row. No rows if the polytope is empty.
+
+    """
+    A_eq = np.atleast_2d(A_eq)
+    b_eq = np.ravel(b_eq)
+    p = A_eq.shape[1]
+    #Bounds are seen as inequalities.
+    a_ineq, b_ineq = bounds_as_constrainsts(bounds)
+    if A_ub is not None and len(A_ub) != 0:
+        a_ineq = np.vstack((np.atleast_2d(A_ub), a_ineq))
+        b_ineq = np.concatenate((np.ravel(b_ub), b_ineq))
+
+    nb_active = p - A_eq.shape[0]
+    all_combs = itertools.combinations(range(0, a_ineq.shape[0]), nb_active)
+    points = [np.empty((0, p))]
+    while True:
+        combs = list(itertools.islice(all_combs, chunk_size))
+        if len(combs) == 0:
+            break
+        combs = np.asarray(combs, dtype = int).reshape(len(combs), nb_active)
+        systems_a = np.concatenate((np.repeat(A_eq[np.newaxis,:,:], len(combs), axis = 0),
+                                    a_ineq[combs]), axis = 1)
+        systems_b = np.concatenate((np.repeat(b_eq[np.newaxis,:], len(combs), axis = 0),
+                                    b_ineq[combs]), axis = 1)
+        regular = np.abs(np.linalg.det(systems_a)) > tolerance
+        if not np.any(regular):
+            continue
+        chunk_points = np.linalg.solve(systems_a[regular], systems_b[regular][:,:,np.newaxis])[:,:,0]
+        feasible = np.all(chunk_points @ a_ineq.T <= b_ineq + tolerance, axis = 1) & \
+            np.all(np.abs(chunk_points @ A_eq.T - b_eq) <= tolerance, axis = 1)
+        points.append(chunk_points[feasible])
+    points = np.vstack(points)
+    if len(points) == 0:
+        return np.empty((0, p))
+    _, idx_unique = np.unique(np.round(points, 8), axis = 0, return_index = True)
+    return points[np.sort(idx_unique)]
@@ -16,6 +16,12 @@ class ModelWeightedSum():
         """
         self._model_parameters = model_parameters
 
+    def get_model_parameters(self):
+        """
+        Get the parameters of the model.
+        """
+        return self._model_parameters
+
     def get_opti_alternative(self, alternative):
         """
         The correct form of the alternative for optimisation.
@@ -126,6 +132,12 @@ class ModelOWA():
         """
         self._model_parameters = model_parameters
 
+    def get_model_parameters(self):
+        """
+        Get the parameters of the model.
+        """
+        return self._model_parameters
+
     def get_opti_alternative(self, alternative):
         """
         The correct form of the alternative for optimisation.
@@ -3,18 +3,137 @@
 
 from copy import deepcopy
 import numpy as np
-from scipy.optimize import linprog
 from elicitation.fusion import tnorm
+from elicitation.linear_program import make_linear_program, compute_vertices, \
+    find_redundant_from_vertices, bounds_as_constrainsts
+from elicitation.spill_store import is_on_file
+
+REDUNDANCY_PERIOD = 4 #Answers between two removals of the redundant constrainsts by LP.
+
+class ConstraintPool:
+    """
+    The hyperplanes Ax <= b of a session, kept once in a preallocated array
+    shared by all the polytopes built from the same first one.
+    """
+
+    __slots__ = ('_A', '_b', '_size')
+
+    def __init__(self, nb_parameters, capacity = 32):
+        """
+        Parameters
+        ----------
+        nb_parameters : integer
+            Number of parameters of the model.
+        capacity : integer, optional
+            Number of hyperplanes allocated at first (the array grows if
+            needed). The default is 32.
+        """
+        self._A = np.zeros((capacity, nb_parameters))
+        self._b = np.zeros(capacity)
+        self._size = 0
+
+    def __getstate__(self):
+        return self._A[0:self._size], self._b[0:self._size], self._size
+
+    def __setstate__(self, state):
+        self._A, self._b, self._size = state
+
+    def find(self, constraint_A, constraint_b):
+        """
+        Find a hyperplane in the pool.
+
+        Parameters
+        ----------
+        constraint_A : array_like
+            A (Ax < b).
+        constraint_b : array_like
+            b (Ax < b).
+
+        Returns
+        -------
+        integer
+            Its row (-1 if not in the pool).
+        bool
+            True if the constrainst is the opposite of the row (-Ax < -b).
+
+        """
+        constraint_A = np.ravel(constraint_A)
+        constraint_b = np.ravel(constraint_b)[0]
+        A = self._A[0:self._size]
+        b = self._b[0:self._size]
+        same = np.nonzero(np.all(A == constraint_A, axis = 1) & (b == constraint_b))[0]
+        if len(same) != 0:
+            return int(same[0]), False
+        opposite = np.nonzero(np.all(A == -constraint_A, axis = 1) & (b == -constraint_b))[0]
+        if len(opposite) != 0:
+            return int(opposite[0]), True
+        return -1, False
+
+    def append(self, constraint_A, constraint_b):
+        """
+        Add a hyperplane to the pool.
+
+        Parameters
+        ----------
+        constraint_A : array_like
+            A (Ax < b).
+        constraint_b : array_like
+            b (Ax < b).
+
+        Returns
+        -------
+        integer
+            Its row.
+
+        """
+        if self._size == len(self._b):
+            #Twice the capacity (at least one row, an unpickled pool can be empty).
+            nb_rows = max(1, len(self._b))
+            self._A = np.vstack((self._A, np.zeros((nb_rows, self._A.shape[1]))))
+            self._b = np.concatenate((self._b, np.zeros(nb_rows)))
+        self._A[self._size] = np.ravel(constraint_A)
+        self._b[self._size] = np.ravel(constraint_b)[0]
+        self._size += 1
+        return self._size - 1
+
+    def get_constrainsts(self, rows, negated):
+        """
+        Get some constrainsts.
+
+        Parameters
+        ----------
+        rows : array_like
+            The rows.
+        negated : array_like
+            1-D array of booleans, the rows to take as -Ax < -b.
+
+        Returns
+        -------
+        array_like
+            A (Ax < b).
+        array_like
+            b (Ax < b).
+
+        """
+        signs = np.where(negated, -1.0, 1.0)
+        return self._A[rows] * signs[:,np.newaxis], self._b[rows] * signs
 
 class Polytope:
     """
     Represent an elementary polytope, a division of the model space, delimited
-    by linear constrainsts.
+    by linear constrainsts. The constrainsts Ax <= b are rows of a pool
+    shared with the other polytopes of the session, the polytope only keeps
+    which rows are in (a bitmask) and which are negated (another bitmask).
     """
 
+    __slots__ = ('_pool', '_members', '_negated', '_answers', '_possibility',
+                 '_constraints_A_eq', '_constraints_b_eq', '_bounds', '_vertices', '_ball', '_box',
+                 '_linear_program', '_points', '_pmr', '_pmr_alternatives', '_pmr_model',
+                 '_pmr_points', '_pmr_argmax', '_pmr_stale', '_method')
+
     def __init__(self, constraints_A_ub, constraints_b_ub,
                  constraints_A_eq, constraints_b_eq,
-                 bounds):
+                 bounds, pool = None):
         """
         Parameters
         ----------
@@ -28,18 +147,101 @@ class Polytope:
             1-D array of values representing b for the constrainst Ax = b.
         bounds : sequence
             Minimum and maximum values for each parameters of the model space.
+        pool : ConstraintPool, optional
+            Where the constrainsts Ax <= b are kept. The default is None (a
+            new one).
         """
+        self._pool = ConstraintPool(len(bounds)) if pool is None else pool
+        self._members = 0
+        self._negated = 0
         self._answers = []
         self._possibility = 1
-        self._constraints_A_ub = constraints_A_ub
-        self._constraints_b_ub = constraints_b_ub
         self._constraints_A_eq = constraints_A_eq
         self._constraints_b_eq = constraints_b_eq
         self._bounds = bounds
+        self._reset_caches()
+        if constraints_A_ub is not None:
+            for constraint_A, constraint_b in zip(np.atleast_2d(constraints_A_ub),
+                                                  np.ravel(constraints_b_ub)):
+                self._add_constraint(constraint_A, constraint_b)
 
-    def add_answer(self, constraint_A, constraint_b, confidence, tnorm_rule = 'minimum'):
+    def _reset_caches(self):
+        """
+        Forget everything which can be computed again.
         """
-        Add a new answer properly
+        self._vertices = None
+        self._ball = None
+        self._box = None
+        self._linear_program = None
+        self._points = None
+        self._pmr = None
+        self._pmr_alternatives = None
+        self._pmr_model = None
+        self._pmr_points = None
+        self._pmr_argmax = None
+        self._pmr_stale = None
+        self._method = None
+
+    def __getstate__(self):
+        #Only what defines the polytope, the rest is computed again if needed.
+        return (self._pool, self._members, self._negated, self._answers, self._possibility,
+                self._constraints_A_eq, self._constraints_b_eq, self._bounds)
+
+    def __setstate__(self, state):
+        (self._pool, self._members, self._negated, self._answers, self._possibility,
+         self._constraints_A_eq, self._constraints_b_eq, self._bounds) = state
+        self._reset_caches()
+
+    def copy(self):
+        """
+        Copy the polytope. The pool is shared, the arrays kept (never changed
+        in place) too, only the LP is copied.
+
+        Returns
+        -------
+        Polytope
+            The copy.
+
+        """
+        new = Polytope.__new__(Polytope)
+        for attribute in Polytope.__slots__:
+            setattr(new, attribute, getattr(self, attribute))
+        new._answers = list(self._answers)
+        if self._linear_program is not None:
+            new._linear_program = deepcopy(self._linear_program)
+        return new
+
+    def _add_constraint(self, constraint_A, constraint_b):
+        """
+        Add a constrainst Ax < b to the polytope.
+
+        Parameters
+        ----------
+        constraint_A : array_like
+            A (Ax < b).
+        constraint_b : array_like
+            b (Ax < b).
+
+        Returns
+        -------
+        None.
+
+        """
+        row, negated = self._pool.find(constraint_A, constraint_b)
+        if row >= 0 and (self._members >> row & 1) and bool(self._negated >> row & 1) != negated:
+            row = -1 #Both sides of a hyperplane: a new row is needed.
+        if row < 0:
+            row, negated = self._pool.append(constraint_A, constraint_b), False
+        self._members |= 1 << row
+        if negated:
+            self._negated |= 1 << row
+
+    def add_answer(self, constraint_A, constraint_b, confidence, tnorm_rule = 'minimum',
+                   redundant = False, vertices = None):
+        """
+        Add a new answer properly. The redundant constrainsts are then
+        removed, from the vertices if known, else by LP every
+        REDUNDANCY_PERIOD answers.
 
         Parameters
         ----------
@@ -51,21 +253,75 @@ class Polytope:
             Certainty degree.
         fusion_rule : string, optional
             The T-norm to apply. The default is 'product'.
+        redundant : bool, optional
+            True if the constrainst is known not to cut the polytope: its
+            region, vertices and PMR stay the same and the constrainst is not
+            kept. The default is False.
+        vertices : array_like, optional
+            The vertices with the constrainst, when known without enumeration
+            (as after a cut, see cut_polytope). The default is None.
 
         Returns
         -------
         None.
 
         """
-        if self._constraints_A_ub is None:
-            self._constraints_A_ub = constraint_A
-            self._constraints_b_ub = constraint_b
-        else:
-            self._constraints_A_ub = np.vstack((self._constraints_A_ub, constraint_A))
-            self._constraints_b_ub = np.vstack((self._constraints_b_ub, constraint_b))
+        if not redundant:
+            #A redundant constrainst is not kept, only its confidence.
+            self._add_constraint(constraint_A, constraint_b)
+            if self._linear_program is not None:
+                self._linear_program.add_constraint(constraint_A, constraint_b)
+            self._update_region(constraint_A, constraint_b)
+            if vertices is not None:
+                self._vertices = vertices
+            #Without vertices, one LP by constrainst: only done periodically.
+            if self._vertices is not None or self._method == 'vertices' or \
+                (len(self._answers) + 1) % REDUNDANCY_PERIOD == 0:
+                self.remove_redundant_constrainsts()
         self._answers.append(confidence)
         self._possibility = tnorm([self._possibility,confidence],tnorm_rule)
 
+    def _update_region(self, constraint_A, constraint_b):
+        """
+        Forget what depends on the region after a new constrainst Ax < b.
+
+        Parameters
+        ----------
+        constraint_A : array_like
+            A (Ax < b).
+        constraint_b : array_like
+            b (Ax < b).
+
+        Returns
+        -------
+        None.
+
+        """
+        self._vertices = None
+        if self._box is not None:
+            lower, upper, _ = self._box
+            lower, upper = _tighten_box(lower, upper, np.ravel(constraint_A), np.ravel(constraint_b)[0])
+            for eq_A, eq_b in zip(np.atleast_2d(self._constraints_A_eq), np.ravel(self._constraints_b_eq)):
+                lower, upper = _tighten_box(lower, upper, eq_A, eq_b)
+                lower, upper = _tighten_box(lower, upper, -eq_A, -eq_b)
+            self._box = lower, upper, False
+        if self._ball is not None:
+            #The ball stays in the polytope if shrunk to the new constrainst.
+            center, radius = self._ball
+            norm = np.linalg.norm(_project(np.ravel(constraint_A)[np.newaxis,:],
+                                           self._constraints_A_eq)[0])
+            gap = np.ravel(constraint_b)[0] - center @ np.ravel(constraint_A)
+            if gap <= 0:
+                self._ball = None
+            elif norm != 0:
+                self._ball = center, min(radius, gap / norm)
+        if self._points is not None:
+            self._points = self._points[self._points @ np.ravel(constraint_A) <= np.ravel(constraint_b)[0] + 10**-9]
+        if self._pmr is not None:
+            #Only the pairs whose maximising weights are now excluded have to be recomputed.
+            violated = self._pmr_points @ np.ravel(constraint_A) > np.ravel(constraint_b)[0] + 10**-9
+            self._pmr_stale = self._pmr_stale | np.append(violated, False)[self._pmr_argmax]
+
     def delete_answer(self, answer_id, fusion_rule = 'minimum'):
         """
         Removes an answer and update the possibility.
@@ -88,11 +344,63 @@ class Polytope:
             possibility = tnorm([possibility, self._answers[i]], fusion_rule)
         self._possibility = possibility
 
+    def _get_rows(self):
+        """
+        Get the rows of the pool in the polytope and if they are negated.
+        """
+        rows = [row for row in range(self._members.bit_length()) if self._members >> row & 1]
+        return rows, [bool(self._negated >> row & 1) for row in rows]
+
     def get_constrainsts(self):
         """
-        Get the constrainsts.
+        Get the constrainsts (built from the pool, A_ub and b_ub are None if
+        there is no constrainst Ax <= b).
+        """
+        rows, negated = self._get_rows()
+        if len(rows) == 0:
+            return None, None, self._constraints_A_eq, self._constraints_b_eq
+        A_ub, b_ub = self._pool.get_constrainsts(rows, negated)
+        return A_ub, b_ub, self._constraints_A_eq, self._constraints_b_eq
+
+    def remove_redundant_constrainsts(self, tolerance = 10**-9):
         """
-        return self._constraints_A_ub, self._constraints_b_ub, self._constraints_A_eq, self._constraints_b_eq
+        Only keep the constrainsts Ax <= b defining a facet of the polytope.
+        If the vertices are known (or used to maximise over the polytope),
+        they are found from the vertices: a facet has as many affinely
+        independent vertices on it as the dimension of the polytope (nothing
+        is removed if the polytope is flat). Else they are found by LP, see
+        LinearProgram.remove_redundant. The LP of the polytope only loses
+        the constrainsts removed and keeps its solver. The answers are not
+        changed.
+
+        Parameters
+        ----------
+        tolerance : float, optional
+            Tolerance to be on a constrainst. The default is 10**-9.
+
+        Returns
+        -------
+        None.
+
+        """
+        rows, negated = self._get_rows()
+        if len(rows) == 0:
+            return
+        if self._vertices is None and self._method == 'vertices':
+            self.get_vertices() #Needed for the next maximisation anyway.
+        A_ub, b_ub = self._pool.get_constrainsts(rows, negated)
+        if self._vertices is None:
+            removed_A, removed_b = self.get_linear_program().remove_redundant(tolerance)
+            redundant = np.any(np.all(A_ub[:,np.newaxis,:] == removed_A[np.newaxis,:,:], axis = 2) &
+                               (b_ub[:,np.newaxis] == removed_b[np.newaxis,:]), axis = 1)
+        else:
+            redundant = find_redundant_from_vertices(self._vertices, A_ub, b_ub,
+                                                     self._constraints_A_eq, tolerance)
+            if self._linear_program is not None and np.any(redundant):
+                self._linear_program.remove_constraints(A_ub[redundant], b_ub[redundant])
+        for row in np.asarray(rows)[redundant]:
+            self._members &= ~(1 << int(row))
+            self._negated &= ~(1 << int(row))
 
     def get_bounds(self):
         """
@@ -100,6 +408,275 @@ class Polytope:
         """
         return self._bounds
 
+    def get_vertices(self, compute = True):
+        """
+        Get the vertices (computed once, until the constrainsts change). If
+        compute is False, None is returned when they are not known yet.
+        """
+        if self._vertices is None and compute:
+            self._vertices = compute_vertices(*self.get_constrainsts(), self._bounds)
+        return self._vertices
+
+    def get_inequalities(self):
+        """
+        Get all the constrainsts Ax <= b, bounds included.
+        """
+        A_ub, b_ub, _, _ = self.get_constrainsts()
+        bounds_A, bounds_b = bounds_as_constrainsts(self._bounds)
+        if A_ub is None:
+            return bounds_A, bounds_b
+        return np.vstack((A_ub, bounds_A)), np.concatenate((b_ub, bounds_b))
+
+    def get_bounding_box(self):
+        """
+        Get a box containing the polytope: from the vertices if known (the
+        smallest one), else from the bounds, shrunk after each cut by
+        interval arithmetic on the new constrainst and the equalities. If a
+        bound is missing and the vertices are not known, it is computed by LP.
+
+        Returns
+        -------
+        array_like
+            The lower bound of each parameter.
+        array_like
+            The upper bound of each parameter.
+
+        """
+        vertices = self.get_vertices(compute = False)
+        if vertices is not None and (self._box is None or not self._box[2]):
+            if len(vertices) == 0:
+                nb_parameters = vertices.shape[1]
+                self._box = np.full(nb_parameters, np.inf), np.full(nb_parameters, -np.inf), True
+            else:
+                self._box = np.min(vertices, axis = 0), np.max(vertices, axis = 0), True
+        if self._box is None:
+            lower = np.asarray([-np.inf if low is None else low for low, _ in self._bounds], dtype = float)
+            upper = np.asarray([np.inf if high is None else high for _, high in self._bounds], dtype = float)
+            if self._members != 0 or not np.all(np.isfinite(lower) & np.isfinite(upper)):
+                #Not the bounds only: by LP.
+                nb_parameters = len(lower)
+                optima, _ = self.get_linear_program().minimize_all(np.vstack((np.eye(nb_parameters),
+                                                                              -np.eye(nb_parameters))))
+                if np.any(np.isnan(optima)):
+                    lower, upper = np.full(nb_parameters, np.inf), np.full(nb_parameters, -np.inf)
+                else:
+                    lower, upper = optima[0:nb_parameters], -optima[nb_parameters:]
+            self._box = lower, upper, False
+        return self._box[0], self._box[1]
+
+    def get_inscribed_ball(self, compute = True):
+        """
+        Get a ball inside the polytope (in the space of the equalities), its
+        Chebyshev center and radius computed by LP. After a cut, the ball is
+        shrunk to stay inside, and computed again only if its center is cut
+        off. If compute is False, None is returned when it is not known.
+
+        Returns
+        -------
+        array_like
+            The center (None if the polytope is empty).
+        float
+            The radius.
+
+        """
+        if self._ball is None and compute:
+            self._ball = _chebyshev_ball(*self.get_constrainsts(), self._bounds)
+        return self._ball
+
+    def crosses_inscribed_ball(self, constraint_A, constraint_b, tolerance = 10**-9,
+                               compute = True):
+        """
+        Check if the hyperplane Ax = b goes through the inscribed ball: then
+        both sides of Ax < b cut the polytope.
+
+        Parameters
+        ----------
+        constraint_A : array_like
+            A (Ax < b).
+        constraint_b : array_like
+            b (Ax < b).
+        tolerance : float, optional
+            Margin inside the ball. The default is 10**-9.
+        compute : bool, optional
+            Compute the ball if it is not known. The default is True.
+
+        Returns
+        -------
+        bool
+            True if it goes through the ball (False if unknown).
+
+        """
+        ball = self.get_inscribed_ball(compute)
+        if ball is None or ball[0] is None:
+            return False
+        center, radius = ball
+        constraint_A = np.ravel(constraint_A)
+        norm = np.linalg.norm(_project(constraint_A[np.newaxis,:], self._constraints_A_eq)[0])
+        return abs(center @ constraint_A - np.ravel(constraint_b)[0]) < radius * norm - tolerance
+
+    def is_simplex(self):
+        """
+        Check if the polytope is the whole simplex: no answer yet, weights
+        summing to 1 and between 0 and 1.
+        """
+        if self._members != 0:
+            return False
+        A_eq = np.atleast_2d(self._constraints_A_eq)
+        if A_eq.shape[0] != 1 or np.any(A_eq != 1) or np.any(np.ravel(self._constraints_b_eq) != 1):
+            return False
+        return all(low == 0 and (high is None or high >= 1) for low, high in self._bounds)
+
+    def get_linear_program(self):
+        """
+        Get the LP over the polytope (built the first time, then kept with
+        the solver so that later solves are warm started).
+        """
+        if self._linear_program is None:
+            self._linear_program = make_linear_program(*self.get_constrainsts(), self._bounds)
+        return self._linear_program
+
+    def add_point(self, point):
+        """
+        Remember a point known to be in the polytope.
+
+        Parameters
+        ----------
+        point : array_like
+            The point.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self._points is None:
+            self._points = np.asarray(point)[np.newaxis,:]
+        else:
+            self._points = np.vstack((self._points, point))
+
+    def get_points(self):
+        """
+        Get the points known to be in the polytope (None if none).
+        """
+        return self._points
+
+    def set_pmr(self, pmr, points, argmax, alternatives, model, stale = None):
+        """
+        Keep the PMR with the weights maximising each pair.
+
+        Parameters
+        ----------
+        pmr : array_like
+            The PMR.
+        points : array_like
+            2-D array, the maximising weights, one per row.
+        argmax : array_like
+            2-D array of integers, the row of points maximising each pair
+            (-1 if none, as on the diagonal).
+        alternatives : array_like
+            The alternatives of the PMR.
+        model : Model
+            The model of the PMR (its type and parameters are kept).
+        stale : array_like, optional
+            2-D array of booleans, the pairs still to compute. The default
+            is None (none).
+
+        Returns
+        -------
+        None.
+
+        """
+        self._pmr = pmr
+        self._pmr_alternatives = alternatives
+        self._pmr_model = type(model), np.array(model.get_model_parameters())
+        self._pmr_points = points
+        self._pmr_argmax = argmax
+        self._pmr_stale = np.zeros(pmr.shape, dtype = bool) if stale is None else stale
+
+    def get_pmr(self, alternatives, model):
+        """
+        Get the PMR kept for some alternatives and a model (None if not
+        computed), the maximising weights, their row for each pair and the
+        pairs to recompute.
+        """
+        if self._pmr is None or (self._pmr_alternatives is not alternatives and
+                                 not np.array_equal(self._pmr_alternatives, alternatives)):
+            return None, None, None, None
+        if type(model) is not self._pmr_model[0] or \
+            not np.array_equal(model.get_model_parameters(), self._pmr_model[1]):
+            return None, None, None, None
+        return self._pmr, self._pmr_points, self._pmr_argmax, self._pmr_stale
+
+    def get_nbytes(self):
+        """
+        Get the bytes of the arrays kept in RAM (not on a file): the PMR, the
+        vertices and the points.
+        """
+        return sum(array.nbytes for array in (self._pmr, self._pmr_points, self._pmr_argmax,
+                                              self._pmr_stale, self._vertices, self._points)
+                   if array is not None and not is_on_file(array))
+
+    def spill(self, store):
+        """
+        Move the arrays kept in RAM (the PMR, the vertices and the points) to
+        files, the arrays are never changed in place so the values stay the
+        same. The LP cannot be moved, it is forgotten (built again if needed).
+
+        Parameters
+        ----------
+        store : SpillStore
+            Where the arrays are moved.
+
+        Returns
+        -------
+        integer
+            The bytes moved.
+
+        """
+        nbytes = self.get_nbytes()
+        if nbytes != 0:
+            (self._pmr, self._pmr_points, self._pmr_argmax, self._pmr_stale,
+             self._vertices, self._points) = \
+                [array if array is None or is_on_file(array) else store.to_file(array)
+                 for array in (self._pmr, self._pmr_points, self._pmr_argmax, self._pmr_stale,
+                               self._vertices, self._points)]
+        self._linear_program = None
+        return nbytes
+
+    def forget_pmr(self):
+        """
+        Forget the PMR kept in the polytope (to save memory).
+        """
+        self._pmr = None
+        self._pmr_alternatives = None
+        self._pmr_model = None
+        self._pmr_points = None
+        self._pmr_argmax = None
+        self._pmr_stale = None
+
+    def forget_solving(self):
+        """
+        Forget what is kept to solve over the polytope (to save memory): the
+        LP, the points, the vertices and the PMR. Its bounding box and ball
+        are kept, they are small.
+        """
+        self.forget_pmr()
+        self._linear_program = None
+        self._points = None
+        self._vertices = None
+
+    def set_method(self, method):
+        """
+        Remember the method used to maximise over the polytope.
+        """
+        self._method = method
+
+    def get_method(self):
+        """
+        Get the method last used to maximise over the polytope (None if none).
+        """
+        return self._method
+
     def get_possibility(self):
         """
         Get the possibility.
@@ -112,6 +689,152 @@ class Polytope:
         """
         return self._answers
 
+def _project(rows, A_eq):
+    """
+    Project rows on the space of the equalities A_eq x = b_eq.
+
+    Parameters
+    ----------
+    rows : array_like
+        2-D array, one vector per row.
+    A_eq : array_like
+        A_eq.
+
+    Returns
+    -------
+    array_like
+        The projected rows.
+
+    """
+    A_eq = np.atleast_2d(A_eq)
+    return rows - (rows @ np.linalg.pinv(A_eq)) @ A_eq
+
+def _tighten_box(lower, upper, constraint_a, constraint_b):
+    """
+    Shrink a box to a constrainst a.x <= b by interval arithmetic: each
+    parameter is bounded by b minus the min of the other terms on the box.
+
+    Parameters
+    ----------
+    lower : array_like
+        The lower bound of each parameter.
+    upper : array_like
+        The upper bound of each parameter.
+    constraint_a : array_like
+        a (a.x < b).
+    constraint_b : float
+        b (a.x < b).
+
+    Returns
+    -------
+    array_like
+        The new lower bounds.
+    array_like
+        The new upper bounds.
+
+    """
+    terms = np.minimum(constraint_a * lower, constraint_a * upper)
+    if not np.all(np.isfinite(terms)):
+        return lower, upper
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        limits = (constraint_b - (np.sum(terms) - terms)) / constraint_a
+    upper = np.where(constraint_a > 0, np.minimum(upper, limits), upper)
+    lower = np.where(constraint_a < 0, np.maximum(lower, limits), lower)
+    return lower, upper
+
+def _split_vertices(polytope, constrainst_a, constrainst_b, tolerance = 10**-9):
+    """
+    Split the vertices of a polytope with a hyperplane Ax = b, as in the
+    double description method: the vertices on each side are kept, and a new
+    vertex is made on each edge going through the hyperplane. Two vertices
+    are on an edge if the constrainsts active on both leave a line.
+
+    Parameters
+    ----------
+    polytope : Polytope
+        A polytope with its vertices.
+    constrainst_a : array_like
+        1-D array of values representing A for the constrainst Ax <= b.
+    constrainst_b : float
+        Value representing b for the constrainst Ax <= b.
+    tolerance : float, optional
+        Distance to b under which Ax is considered on the hyperplane. The
+        default is 10**-9.
+
+    Returns
+    -------
+    array_like
+        The vertices of the polytope with Ax <= b.
+    array_like
+        The vertices of the polytope with Ax >= b.
+
+    """
+    vertices = polytope.get_vertices()
+    values = vertices @ constrainst_a - constrainst_b
+    below = values < -tolerance
+    above = values > tolerance
+    on = ~below & ~above
+    A_ineq, b_ineq = polytope.get_inequalities()
+    A_eq = np.atleast_2d(polytope.get_constrainsts()[2])
+    nb_parameters = vertices.shape[1]
+    nb_active = nb_parameters - np.linalg.matrix_rank(A_eq)
+    tight = np.abs(vertices @ A_ineq.T - b_ineq) <= tolerance
+    new_vertices = []
+    for i in np.nonzero(below)[0]:
+        common = tight[i] & tight[above]
+        for j, shared in zip(np.nonzero(above)[0], common):
+            if np.count_nonzero(shared) < nb_active - 1 or \
+                np.linalg.matrix_rank(np.vstack((A_eq, A_ineq[shared]))) != nb_parameters - 1:
+                continue
+            t = values[i] / (values[i] - values[j])
+            new_vertices.append(vertices[i] + t * (vertices[j] - vertices[i]))
+    new_vertices = np.asarray(new_vertices).reshape(-1, nb_parameters)
+    if len(new_vertices) != 0:
+        _, idx_unique = np.unique(np.round(new_vertices, 8), axis = 0, return_index = True)
+        new_vertices = new_vertices[np.sort(idx_unique)]
+    return np.vstack((vertices[below | on], new_vertices)), np.vstack((vertices[above | on], new_vertices))
+
+def _chebyshev_ball(A_ub, b_ub, A_eq, b_eq, bounds):
+    """
+    Compute the Chebyshev center of a polytope (the center of the largest
+    ball inside it, in the space of the equalities) with one LP: max r such
+    that a.x + r||a|| <= b for all the constrainsts and bounds.
+
+    Parameters
+    ----------
+    A_ub : array_like
+        A_ub (can be None).
+    b_ub : array_like
+        b_ub (can be None).
+    A_eq : array_like
+        A_eq.
+    b_eq : array_like
+        b_eq.
+    bounds : sequence
+        bounds.
+
+    Returns
+    -------
+    tuple
+        The center (None if the polytope is empty) and the radius.
+
+    """
+    A_eq = np.atleast_2d(A_eq)
+    p = A_eq.shape[1]
+    rows_a, rows_b = bounds_as_constrainsts(bounds)
+    if A_ub is not None:
+        rows_a = np.vstack((np.atleast_2d(A_ub), rows_a))
+        rows_b = np.concatenate((np.ravel(b_ub), rows_b))
+    norms = np.linalg.norm(_project(rows_a, A_eq), axis = 1)
+    c = np.zeros(p + 1)
+    c[p] = -1
+    _, x = make_linear_program(np.hstack((rows_a, norms[:,np.newaxis])), rows_b,
+                               np.hstack((A_eq, np.zeros((A_eq.shape[0], 1)))), b_eq,
+                               [(None, None)] * p + [(0, None)]).minimize(c)
+    if x is None:
+        return None, 0
+    return x[0:p], x[p]
+
 def construct_constrainst(alt_1, alt_2, alt_1_prefered, model):
     """Construct a constrainst according to Current Solution Strategy.
 
@@ -163,22 +886,20 @@ def is_polytope_not_empty(A_ub, b_ub, A_eq, b_eq, bounds):
         If it is empty.
 
     """
-    if A_ub.ndim == 1:
-        A_ub = A_ub[np.newaxis,:]
-    if A_eq.ndim == 1:
-        A_eq = A_eq[np.newaxis,:]
-    _, p = A_ub.shape
-    if b_ub.ndim == 2:
-        b_ub = b_ub[:,0]
-    if b_eq.ndim == 2:
-        b_eq = b_eq[:,0]
-    c = np.ones((p,1))
-    linprog_res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds,
-                          method = 'highs')
-    return linprog_res.fun is not None
-
-def intersection_checker(polytope, constrainst_a, constrainst_b):
-    """Check if a constrainst Ax < b intersects with a polytope.
+    return make_linear_program(A_ub, b_ub, A_eq, b_eq, bounds).find_point() is not None
+
+def intersection_checker(polytope, constrainst_a, constrainst_b, tolerance = 10**-9):
+    """Check if a constrainst Ax < b intersects with a polytope. If Ax < b
+    holds (or not) on all the bounding box of the polytope, it does not. If
+    the hyperplane goes through a ball inside the polytope (computed once by LP
+    if the vertices are not known), it does. Else it is decided from the min
+    and the max of Ax on the polytope: the vertices if known, else the known
+    points, give them without LP, else one LP is solved for each missing side.
+    A hyperplane only touching the polytope (within the tolerance) does not
+    cut it if the polytope is on the side of Ax < b: the flat cell on the
+    other side is in the polytope, with a lower possibility. On the side of
+    Ax > b, the flat cell Ax = b has a higher possibility than the polytope,
+    so the polytope is cut to keep it.
 
     Parameters
     ----------
@@ -188,52 +909,78 @@ def intersection_checker(polytope, constrainst_a, constrainst_b):
         1-D array of values representing A for the constrainst Ax <= b.
     constrainst_b : float
         Value representing b for the constrainst Ax <= b.
+    tolerance : float, optional
+        Distance to b under which Ax is considered on the hyperplane. The
+        default is 10**-9.
         
     Returns
     -------
     float
-        0 if the constrainst intersects. 
+        0 if the constrainst intersects (also if b = min(Ax) < max(Ax)).
         -1 if b < min(Ax) given the constrainsts and bounds of the polytope.
-        1 if b > max(Ax) given the constrainsts and bounds of the polytope.
+        1 if b >= max(Ax) given the constrainsts and bounds of the polytope
+        (also if the polytope is empty).
     """
-    A_ub, b_ub, A_eq, b_eq = polytope.get_constrainsts()
-    polytope_bounds = polytope.get_bounds()
-    Aplus = constrainst_a
-    Amoins = -constrainst_a
-    bplus = constrainst_b
-    bmoins = -constrainst_b
-    if A_ub is not None:
-        Aplus = np.vstack((Aplus, A_ub))
-        Amoins = np.vstack((Amoins, A_ub))
-        bplus = np.vstack((bplus, b_ub))
-        bmoins = np.vstack((bmoins, b_ub))
-    first_side = is_polytope_not_empty(Aplus, bplus, A_eq, b_eq, polytope_bounds)
-    second_side = is_polytope_not_empty(Amoins, bmoins, A_eq, b_eq, polytope_bounds)
-    if first_side and second_side :
-        return 0
-    if first_side:
+    constrainst_a = np.ravel(constrainst_a)
+    constrainst_b = np.ravel(constrainst_b)[0]
+    #The box of the polytope can prove a side in O(p).
+    lower, upper = polytope.get_bounding_box()
+    if np.any(lower > upper + tolerance):
+        return 1 #Empty.
+    terms = np.vstack((constrainst_a * lower, constrainst_a * upper))
+    if np.sum(np.max(terms, axis = 0)) <= constrainst_b + tolerance:
         return 1
-    if second_side:
+    if np.sum(np.min(terms, axis = 0)) > constrainst_b + tolerance:
         return -1
-    
-    #Case it does not work: add some noise.
-    Aplus = Aplus + np.random.normal(0.0, 10**-8, size = Aplus.shape)
-    Amoins = Amoins + np.random.normal(0.0, 10**-8, size = Amoins.shape)
-    bplus = bplus + np.random.normal(0.0, 10**-8, size = bplus.shape)
-    bmoins = bmoins + np.random.normal(0.0, 10**-8, size = bmoins.shape)
-    first_side = is_polytope_not_empty(Aplus, bplus, A_eq, b_eq, polytope_bounds)
-    second_side = is_polytope_not_empty(Amoins, bmoins, A_eq, b_eq, polytope_bounds)
-    if first_side and second_side :
+    vertices = polytope.get_vertices(compute = False)
+    if polytope.crosses_inscribed_ball(constrainst_a, constrainst_b, tolerance,
+                                       compute = vertices is None):
         return 0
-    if first_side:
-        return 1
-    if second_side:
+    if vertices is not None:
+        #The min and max are reached on the vertices.
+        values = vertices @ constrainst_a
+        below = bool(np.any(values < constrainst_b - tolerance))
+        above = bool(np.any(values > constrainst_b + tolerance))
+        if above and (below or np.min(values) <= constrainst_b + tolerance):
+            return 0
+        return -1 if above else 1
+    #Points already known in the polytope prove a side without LP.
+    below = False
+    above = False
+    touching = False
+    points = polytope.get_points()
+    if points is not None:
+        values = points @ constrainst_a
+        below = bool(np.any(values < constrainst_b - tolerance))
+        above = bool(np.any(values > constrainst_b + tolerance))
+    if below and above:
+        return 0
+    linear_program = polytope.get_linear_program()
+    if not above:
+        value, point = linear_program.minimize(-constrainst_a)
+        if point is None:
+            return 1 #Empty.
+        polytope.add_point(point)
+        above = -value > constrainst_b + tolerance
+    if not below:
+        value, point = linear_program.minimize(constrainst_a)
+        if point is None:
+            return 1 #Empty.
+        polytope.add_point(point)
+        below = value < constrainst_b - tolerance
+        touching = value <= constrainst_b + tolerance
+    if above and (below or touching):
+        return 0
+    if above:
         return -1
-    
-    return None #If fails.
+    return 1
 
-def cut_polytope(polytope, constrainst_a, constrainst_b, confidence = 1, fusion_rule = 'minimum'):
+def cut_polytope(polytope, constrainst_a, constrainst_b, confidence = 1, fusion_rule = 'minimum',
+                 keep_vertices = False):
     """Seperate a polytope into two polytopes according to a constrainst Ax < b.
+    With keep_vertices, the vertices of the polytope (computed if not known)
+    are split between the two polytopes, see _split_vertices, so they are
+    known without LP or enumeration.
 
     Parameters
     ----------
@@ -248,6 +995,8 @@ def cut_polytope(polytope, constrainst_a, constrainst_b, confidence = 1, fusion_
         of the second polytope.
     fusion_rule : string
         The T-norm used for merging information.
+    keep_vertices : bool, optional
+        Give their vertices to the two polytopes. The default is False.
         
     Returns
     -------
@@ -263,8 +1012,14 @@ def cut_polytope(polytope, constrainst_a, constrainst_b, confidence = 1, fusion_
     """
     if confidence < 0 or confidence > 1:
         raise ValueError('The confidence has to be in the interval [0,1].')
-    polytope_1 = deepcopy(polytope)
-    polytope_2 = deepcopy(polytope)
-    polytope_1.add_answer(constrainst_a, constrainst_b, 1, fusion_rule)
-    polytope_2.add_answer(-constrainst_a, -constrainst_b, 1-confidence, fusion_rule)
+    if keep_vertices:
+        vertices_1, vertices_2 = _split_vertices(polytope, np.ravel(constrainst_a),
+                                                 np.ravel(constrainst_b)[0])
+    else:
+        vertices_1, vertices_2 = None, None
+    polytope_1 = polytope.copy()
+    polytope_2 = polytope.copy()
+    polytope_1.add_answer(constrainst_a, constrainst_b, 1, fusion_rule, vertices = vertices_1)
+    polytope_2.add_answer(-constrainst_a, -constrainst_b, 1-confidence, fusion_rule,
+                          vertices = vertices_2)
     return polytope_1, polytope_2
\ No newline at end of file
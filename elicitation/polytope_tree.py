@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""The partition of the model space in polytopes, as a binary cut tree."""
+
+from elicitation.fusion import tnorm
+from elicitation.polytope import cut_polytope, intersection_checker
+
+class PolytopeTree:
+    """
+    A node of the cut tree. A leaf is a polytope of the partition, an
+    internal node keeps the region of the polytope which was cut (with its
+    box and ball only, see Polytope.forget_solving) and an upper bound of the
+    possibility of its leaves. A constrainst not cutting the region of a node
+    applies to all its leaves with one check.
+    """
+
+    __slots__ = ('_polytope', '_children', '_possibility')
+
+    def __init__(self, polytope):
+        """
+        Parameters
+        ----------
+        polytope : Polytope
+            The polytope of the leaf.
+        """
+        self._polytope = polytope
+        self._children = None #A leaf.
+        self._possibility = polytope.get_possibility()
+
+    def add_answer(self, constrainst_a, constrainst_b, confidence, tnorm_rule = 'product',
+                   min_possibility = 0, keep_vertices = True):
+        """
+        Add an answer Ax < b: the leaves it cuts are cut, the others get it
+        (or its opposite) with their possibility updated. The leaves with a
+        possibility not above min_possibility are removed.
+
+        Parameters
+        ----------
+        constrainst_a : array_like
+            A (Ax < b).
+        constrainst_b : array_like
+            b (Ax < b).
+        confidence : float
+            Confidence degree of the answer.
+        tnorm_rule : string, optional
+            The T-norm to apply. The default is 'product'.
+        min_possibility : float, optional
+            Min possibility to keep a polytope. The default is 0.
+        keep_vertices : bool, optional
+            Split the vertices of the leaves cut when they are known, see
+            cut_polytope. The default is True.
+
+        Returns
+        -------
+        bool
+            False if there is no leaf left.
+
+        """
+        side = intersection_checker(self._polytope, constrainst_a, constrainst_b)
+        if self._children is not None:
+            self._polytope.forget_solving() #The LP and points of the check.
+        if side == 1:
+            return self._add_to_leaves(constrainst_a, constrainst_b, 1, tnorm_rule, min_possibility)
+        if side == -1:
+            return self._add_to_leaves(-constrainst_a, -constrainst_b, 1-confidence, tnorm_rule,
+                                       min_possibility)
+        if self._children is None:
+            keep_vertices = keep_vertices and self._polytope.get_vertices(compute = False) is not None
+            polytope_1, polytope_2 = cut_polytope(self._polytope, constrainst_a, constrainst_b,
+                                                  confidence, tnorm_rule, keep_vertices)
+            self._polytope.forget_solving() #Only its region is used now.
+            self._children = [PolytopeTree(polytope) for polytope in (polytope_1, polytope_2)
+                              if polytope.get_possibility() > min_possibility]
+        else:
+            self._children = [child for child in self._children
+                              if child.add_answer(constrainst_a, constrainst_b, confidence,
+                                                  tnorm_rule, min_possibility, keep_vertices)]
+        if len(self._children) == 0:
+            return False
+        self._possibility = max(child.get_possibility() for child in self._children)
+        return True
+
+    def _add_to_leaves(self, constrainst_a, constrainst_b, confidence, tnorm_rule, min_possibility):
+        """
+        Add a constrainst Ax < b known not to cut the leaves.
+
+        Parameters
+        ----------
+        constrainst_a : array_like
+            A (Ax < b).
+        constrainst_b : array_like
+            b (Ax < b).
+        confidence : float
+            Confidence degree of the constrainst.
+        tnorm_rule : string
+            The T-norm to apply.
+        min_possibility : float
+            Min possibility to keep a polytope.
+
+        Returns
+        -------
+        bool
+            False if there is no leaf left.
+
+        """
+        #The T-norm is increasing: the bound of the node stays a bound.
+        if tnorm([self._possibility, confidence], tnorm_rule) <= min_possibility:
+            return self._remove_leaves()
+        if self._children is None:
+            self._polytope.add_answer(constrainst_a, constrainst_b, confidence, tnorm_rule,
+                                      redundant = True)
+            self._possibility = self._polytope.get_possibility()
+            return self._possibility > min_possibility or self._remove_leaves()
+        self._children = [child for child in self._children
+                          if child._add_to_leaves(constrainst_a, constrainst_b, confidence,
+                                                  tnorm_rule, min_possibility)]
+        if len(self._children) == 0:
+            return False
+        self._possibility = max(child.get_possibility() for child in self._children)
+        return True
+
+    def remove_polytopes(self, polytope_ids):
+        """
+        Remove leaves.
+
+        Parameters
+        ----------
+        polytope_ids : set
+            The id of the polytopes of the leaves to remove.
+
+        Returns
+        -------
+        bool
+            False if there is no leaf left.
+
+        """
+        if self._children is None:
+            return id(self._polytope) not in polytope_ids or self._remove_leaves()
+        self._children = [child for child in self._children
+                          if child.remove_polytopes(polytope_ids)]
+        if len(self._children) == 0:
+            return False
+        self._possibility = max(child.get_possibility() for child in self._children)
+        return True
+
+    def _remove_leaves(self):
+        """
+        Remove all the leaves of the node (for the root, as the other nodes
+        are removed by their parent).
+
+        Returns
+        -------
+        bool
+            False.
+
+        """
+        self._children = [] #An internal node without leaves.
+        return False
+
+    def get_possibility(self):
+        """
+        Get the possibility (the max of the leaves for a node).
+        """
+        return self._possibility
+
+    def get_polytopes(self):
+        """
+        Get the polytopes of the leaves, from left to right.
+        """
+        if self._children is None:
+            return [self._polytope]
+        return [polytope for child in self._children for polytope in child.get_polytopes()]
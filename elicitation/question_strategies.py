@@ -42,6 +42,35 @@ class CSSQuestionStrategy():
         self._visited_pairs[alt_idx_1,alt_idx_2] = 1
         self._visited_pairs[alt_idx_2,alt_idx_1] = 1
 
+    def get_open_alternatives(self):
+        """
+        Get the alternatives which still have a pair not compared.
+
+        Returns
+        -------
+        array_like
+            1-D array of booleans.
+
+        """
+        return ~np.all(self._visited_pairs == 1, axis = 1)
+
+    def get_open_oponents(self, candidate_alt_id):
+        """
+        Get the alternatives not compared yet with a candidate.
+
+        Parameters
+        ----------
+        candidate_alt_id : integer
+            The indice of the candidate alternative.
+
+        Returns
+        -------
+        array_like
+            1-D array of booleans.
+
+        """
+        return self._visited_pairs[candidate_alt_id,:] != 1
+
     def give_candidate(self, mr):
         """
         Get a candidate.
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Keep the arrays of the polytopes (PMR, vertices, points) and of the focal sets
+on memory-mapped files above a RAM budget."""
+
+import tempfile
+import numpy as np
+
+def is_on_file(array):
+    """
+    Check if an array is a view on a memory-mapped file (a copy of it is not).
+
+    Parameters
+    ----------
+    array : array_like
+        The array.
+
+    Returns
+    -------
+    bool
+        True if on a file.
+
+    """
+    while isinstance(array, np.ndarray):
+        if isinstance(array, np.memmap) and array.base is not None and \
+            not isinstance(array.base, np.ndarray):
+            return True #The mapping itself.
+        array = array.base
+    return False
+
+class SpillStore:
+    """
+    Arrays moved from RAM to memory-mapped temporary files, the system then
+    reads them back and frees them as needed. The files are cut in slabs
+    (one mapping each), the arrays are views on them. The files have no
+    name and are deleted once nothing uses them anymore.
+    """
+
+    def __init__(self, ram_budget, directory = None, slab_size = 2**26):
+        """
+        Parameters
+        ----------
+        ram_budget : integer
+            Bytes of arrays of the polytopes and focal sets kept in RAM, above
+            it the arrays of the polytopes with the lowest possibility are
+            moved to files (see Polytope.spill), then those of the focal sets
+            (see FocalSets.spill).
+        directory : string, optional
+            Where the files are made. The default is None (the temporary
+            directory of the system).
+        slab_size : integer, optional
+            Bytes of each file. The default is 2**26.
+        """
+        self._ram_budget = ram_budget
+        self._directory = directory
+        self._slab_size = slab_size
+        self._slab = None
+        self._offset = 0
+        self._nbytes = 0
+
+    def to_file(self, array):
+        """
+        Copy an array to the files.
+
+        Parameters
+        ----------
+        array : array_like
+            The array.
+
+        Returns
+        -------
+        array_like
+            The same values, on a file.
+
+        """
+        nbytes = max(array.nbytes, 1)
+        if self._slab is None or self._offset + nbytes > len(self._slab):
+            with tempfile.TemporaryFile(dir = self._directory) as file:
+                self._slab = np.memmap(file, dtype = np.uint8, mode = 'w+',
+                                       shape = max(self._slab_size, nbytes))
+            self._offset = 0
+        view = self._slab[self._offset:self._offset + array.nbytes].view(np.ndarray)
+        view = view.view(array.dtype).reshape(array.shape)
+        view[...] = array
+        self._offset = self._offset + -(-nbytes // 64) * 64 #Aligned.
+        self._nbytes = self._nbytes + array.nbytes
+        return view
+
+    def balance(self, polytope_list, focal_sets = None):
+        """
+        Move the arrays of polytopes to the files until the arrays still in
+        RAM fit the budget, from the lowest possibility, then those of the
+        focal sets.
+
+        Parameters
+        ----------
+        polytope_list : list
+            The polytopes.
+        focal_sets : FocalSets, optional
+            The focal sets of the polytopes. The default is None (none).
+
+        Returns
+        -------
+        None.
+
+        """
+        ram = sum(polytope.get_nbytes() for polytope in polytope_list)
+        if focal_sets is not None:
+            ram = ram + focal_sets.get_nbytes()
+        if ram <= self._ram_budget:
+            return
+        possibilities = [polytope.get_possibility() for polytope in polytope_list]
+        for i in np.argsort(possibilities, kind = 'stable'):
+            if ram <= self._ram_budget:
+                break
+            ram = ram - polytope_list[i].spill(self)
+        if focal_sets is not None and ram > self._ram_budget:
+            focal_sets.spill(self, ram - self._ram_budget)
+
+    def get_nbytes(self):
+        """
+        Get the bytes moved to the files so far.
+        """
+        return self._nbytes
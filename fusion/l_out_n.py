@@ -2,6 +2,7 @@
 """This module gives tools to do l-out-of-k fusion as shown in paper."""
 
 import itertools
+from math import comb
 import numpy as np
 from elicitation.fusion import tnorm, tconorm
 
@@ -26,9 +27,19 @@ def find_incorrect_answers(polytope_list):
         all_detected_incorrect_answers.append(detected_incorrect_answers)
     return all_detected_incorrect_answers
 
-def k_among_n_fusion(polytope_list, k, n):
+def k_among_n_fusion(polytope_list, k, n, tnorm_rule = 'product', tconorm_rule = 'probabilistic'):
     """
-    l-out-of-k fusion as shown in the paper.
+    l-out-of-k fusion as shown in the paper: the T-conorm, over all the
+    subsets of k answers, of the T-norm of the answers. The subsets are not
+    listed when an exact shortcut exists:
+    - with the maximum T-conorm, the T-norm of the k highest answers,
+    - with the minimum T-norm, the answer of rank i (from the lowest) is the
+    min of C(n-i, k-1) subsets,
+    - with the product T-norm and the bounded T-conorm, the elementary
+    symmetric sum of degree k of the answers,
+    - with the product T-norm and the probabilistic T-conorm, the log of
+    1 minus the result is a series of elementary symmetric sums of the powers
+    of the answers (for the polytopes where it is faster than the subsets).
 
     Parameters
     ----------
@@ -38,6 +49,10 @@ def k_among_n_fusion(polytope_list, k, n):
         Number of correct answers.
     n : interger
         Number of total answers.
+    tnorm_rule : string, optional
+        The T-norm. The default is 'product'.
+    tconorm_rule : string, optional
+        The T-conorm. The default is 'probabilistic'.
 
     Returns
     -------
@@ -45,13 +60,162 @@ def k_among_n_fusion(polytope_list, k, n):
         The new confidence degrees.
 
     """
+    #The first n answers of each polytope.
+    answers = np.asarray([polytope.get_answers()[0:n] for polytope in polytope_list],
+                         dtype = float).reshape(-1, n)
+    if tconorm_rule == 'maximum':
+        #The T-norms are increasing.
+        return tnorm(-np.sort(-answers, axis = 1)[:,0:k], tnorm_rule, axis = 1)
+    if tnorm_rule == 'minimum' and tconorm_rule in ('probabilistic', 'bounded'):
+        return _minimum_fusion(answers, k, tconorm_rule)
+    if tnorm_rule == 'product' and tconorm_rule == 'bounded':
+        return np.minimum(1, _elementary_symmetric(answers, k))
+    if tnorm_rule == 'product' and tconorm_rule == 'probabilistic':
+        return _product_probabilistic_fusion(answers, k)
+    return _listed_fusion(answers, k, tnorm_rule, tconorm_rule)
+
+def _elementary_symmetric(values, k):
+    """
+    Elementary symmetric sums of degree k (the sum of the products of all
+    the subsets of k values), by dynamic programming.
+
+    Parameters
+    ----------
+    values : array_like
+        The values, along the last axis.
+    k : integer
+        The degree.
+
+    Returns
+    -------
+    array_like
+        The sums.
+
+    """
+    sums = np.zeros(values.shape[0:-1] + (k+1,))
+    sums[...,0] = 1
+    for i in range(0, values.shape[-1]):
+        sums[...,1:] = sums[...,1:] + values[...,i,None] * sums[...,0:-1]
+    return sums[...,k]
+
+def _minimum_fusion(answers, k, tconorm_rule):
+    """
+    l-out-of-k fusion with the minimum T-norm: once sorted, the answer i
+    (from 0, the lowest) is the min of the C(n-1-i, k-1) subsets with it and
+    k-1 higher answers.
+
+    Parameters
+    ----------
+    answers : array_like
+        2-D array, the answers of each polytope.
+    k : integer
+        Number of correct answers.
+    tconorm_rule : string
+        'probabilistic' or 'bounded'.
+
+    Returns
+    -------
+    array_like
+        The new confidence degrees.
+
+    """
+    answers = np.sort(answers, axis = 1)
+    n = answers.shape[1]
+    counts = np.asarray([float(comb(n - 1 - i, k - 1)) for i in range(0, n)])
+    if tconorm_rule == 'bounded':
+        return np.minimum(1, np.sum(counts * answers, axis = 1))
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        log_rest = np.where(counts > 0, counts * np.log1p(-answers), 0)
+    return -np.expm1(np.sum(log_rest, axis = 1))
+
+def _product_probabilistic_fusion(answers, k, precision = 2**-53, chunk_size = 2**22):
+    """
+    l-out-of-k fusion with the product T-norm and the probabilistic
+    T-conorm: 1 - prod(1 - p_S) over the subsets S, p_S the product of
+    their answers. As log(1 - p) = -sum(p^m / m), the log of the product is
+    -sum(e_k(a^m) / m), e_k the elementary symmetric sum of degree k. Each
+    term is at most the previous one times the highest p_S, which bounds
+    the rest of the series: the terms are added until it is negligible for
+    the result. If listing the subsets is cheaper for a polytope, it is done
+    instead.
+
+    Parameters
+    ----------
+    answers : array_like
+        2-D array, the answers of each polytope.
+    k : integer
+        Number of correct answers.
+    precision : float, optional
+        Relative precision of the result. The default is 2**-53.
+    chunk_size : integer, optional
+        Number of powers of the answers computed at once (powers x polytopes
+        x answers), at least one power of the polytopes left. The default is
+        2**22.
+
+    Returns
+    -------
+    array_like
+        The new confidence degrees.
+
+    """
+    n = answers.shape[1]
+    res = np.zeros(len(answers))
+    highest = np.prod(-np.sort(-answers, axis = 1)[:,0:k], axis = 1)
+    res[highest == 1] = 1 #At least k answers are 1.
+    series = (highest > 0) & (highest < 1)
+    with np.errstate(divide = 'ignore'):
+        nb_terms = np.log(precision * (1 - highest)) / np.log(highest)
+    series = series & (nb_terms * n < comb(n, k))
+    listed = (highest > 0) & (highest < 1) & ~series
+    if np.any(listed):
+        res[listed] = _listed_fusion(answers[listed], k, 'product', 'probabilistic')
+    rows = np.nonzero(series)[0]
+    log_rest = np.zeros(len(answers))
+    power = 1
+    nb_powers = 16
+    while len(rows) != 0:
+        powers = np.arange(power, power + min(nb_powers, max(1, chunk_size // (len(rows) * n))))
+        terms = _elementary_symmetric(answers[rows][None,:,:] ** powers[:,None,None], k) / powers[:,None]
+        log_rest[rows] = log_rest[rows] - np.sum(terms, axis = 0)
+        ratio = highest[rows] / (1 - highest[rows])
+        rest = terms[-1] * ratio * powers[-1] / (powers[-1] + 1)
+        #Error of the result: the rest times the derivative of 1 - exp.
+        rows = rows[rest * np.exp(log_rest[rows]) > -precision * np.expm1(log_rest[rows])]
+        power = power + len(powers)
+        nb_powers = min(2 * nb_powers, 1024)
+    res[series] = -np.expm1(log_rest[series])
+    return res
+
+def _listed_fusion(answers, k, tnorm_rule, tconorm_rule, chunk_size = 2**14):
+    """
+    l-out-of-k fusion listing all the subsets, by chunks (the T-conorms are
+    associative).
+
+    Parameters
+    ----------
+    answers : array_like
+        2-D array, the answers of each polytope.
+    k : integer
+        Number of correct answers.
+    tnorm_rule : string
+        The T-norm.
+    tconorm_rule : string
+        The T-conorm.
+    chunk_size : integer, optional
+        Number of subsets for each chunk. The default is 2**14.
+
+    Returns
+    -------
+    array_like
+        The new confidence degrees.
+
+    """
+    combs_k = itertools.combinations(range(0, answers.shape[1]), k)
     tconorms = []
-    for polytope in polytope_list:
-        answers = np.asarray(polytope.get_answers())
-        combs_k = itertools.combinations(range(0,n),k)
-        tnorms = []
-        for comb_k in combs_k:
-            selected_answers = answers[list(comb_k)]
-            tnorms.append(tnorm(selected_answers))
-        tconorms.append(tconorm(tnorms))
-    return np.asarray(tconorms)
+    while True:
+        chunk = np.asarray(list(itertools.islice(combs_k, chunk_size)), dtype = int).reshape(-1, k)
+        if len(chunk) == 0:
+            break
+        tnorms = tnorm(answers[:,chunk], tnorm_rule, axis = 2)
+        tconorms.append(tconorm(tnorms, tconorm_rule, axis = 1))
+    return tconorm(np.stack(tconorms, axis = 1), tconorm_rule, axis = 1)
@@ -151,9 +151,5 @@ def update_possibility_list(all_answers, best_cs, tnorm_rule = "product"):
     list
         The updated confidence degrees list.
     """
-    nb_polytopes = all_answers.shape[0]
-    possibility_list = np.zeros(nb_polytopes)
     subset_answers = all_answers[:, best_cs]
-    for i in range(0, nb_polytopes):
-        possibility_list[i] = tnorm(subset_answers[i,:], tnorm_rule)
-    return possibility_list
+    return tnorm(subset_answers, tnorm_rule, axis = 1)
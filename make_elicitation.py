@@ -8,26 +8,32 @@ import pickle
 import multiprocessing
 from multiprocessing import Value
 import numpy as np
-from scipy.optimize import linprog
 from elicitation.elicitation import get_recommendation, robust_elicitation, possibilist_elicitation
 from elicitation.models import ModelWeightedSum
 from elicitation.polytope import Polytope
+from elicitation.linear_program import make_linear_program, set_backend
 from fusion.l_out_n import find_incorrect_answers, k_among_n_fusion
 from fusion.mcs import get_answers, find_all_maximum_coherent_subsets, update_possibility_list
 
 nb_questions = 15
 conf_type = 'uniform'
 nb_parameters = 4
+lp_backend = None #'linprog', 'highs' or 'numpy', None for the default one.
+method = 'auto' #'vertices', 'linprog' or 'auto' to choose for each polytope (from nb_parameters...).
+ram_budget = None #Bytes of arrays of the polytopes in RAM for each worker, the rest on files. None for no limit.
+spill_directory = None #Where these files are made, None for the temporary directory.
 path = 'data/criteria_' + str(nb_parameters) + '/' + str(conf_type) + '/questions_' + str(nb_questions) + '/'
 
 def init_globals(counter):
     global cnt
     cnt = counter
+    if lp_backend is not None:
+        set_backend(lp_backend)
     
 def make_dateset_certain(alternatives, model_values, rational):
     model = ModelWeightedSum(model_values)
     res = robust_elicitation(alternatives, model, max_iter = nb_questions,
-                             rational = rational)
+                             rational = rational, method = method)
     with cnt.get_lock():
         cnt.value += 1
         print(cnt.value)
@@ -37,7 +43,9 @@ def make_dateset_certain(alternatives, model_values, rational):
 def make_dataset_zero(alternatives, model_values, confidence_values, rational):
     res = possibilist_elicitation(alternatives, ModelWeightedSum(model_values), 
                                   confidence_values, max_iter = nb_questions, 
-                                  inconsistency_type = 'zero', rational = rational)
+                                  inconsistency_type = 'zero', rational = rational,
+                                  method = method, ram_budget = ram_budget,
+                                  spill_directory = spill_directory)
     with cnt.get_lock():
         cnt.value += 1
         print(cnt.value)
@@ -47,7 +55,9 @@ def make_dataset_zero(alternatives, model_values, confidence_values, rational):
 def make_dataset_ignorance(alternatives, model_values, confidence_values, rational):
     res = possibilist_elicitation(alternatives, ModelWeightedSum(model_values), 
                                   confidence_values, max_iter = nb_questions, 
-                                  inconsistency_type = 'ignorance', rational = rational)
+                                  inconsistency_type = 'ignorance', rational = rational,
+                                  method = method, ram_budget = ram_budget,
+                                  spill_directory = spill_directory)
     with cnt.get_lock():
         cnt.value += 1
         print(cnt.value)
@@ -118,12 +128,11 @@ def epsilon_consistency(A_ub, b_ub, alternatives, model_values, inconsistency_ty
     A_eq_new = np.hstack((A_eq, np.ones((1,n))))
     bounds_new = bounds
     bounds_new = bounds_new + tuple((0, None) for _ in range(n))
-    linprog_res = linprog(c, A_ub_new, b_ub, A_eq_new, b_eq, bounds_new,
-                          method = 'highs')
-    b_ub_new = b_ub + linprog_res.x[p:]
+    _, x = make_linear_program(A_ub_new, b_ub, A_eq_new, b_eq, bounds_new).minimize(c)
+    b_ub_new = b_ub + x[p:]
     new_polytope = Polytope(A_ub,b_ub_new,A_eq,b_eq, bounds)
     res = get_recommendation([new_polytope], [1], alternatives,
-                             model, inconsistency_type)
+                             model, inconsistency_type, method = method)
     with cnt.get_lock():
         cnt.value += 1
         print(cnt.value)
@@ -162,6 +171,7 @@ if __name__ == '__main__':
     with open(path + 'classic.pk','wb') as f:
         d = {}
         d['real_regret_classic'] = np.asarray([d['real_regret'] for d in elicitation_classic])
+        d['method_classic'] = [d['method'] for d in elicitation_classic]
         pickle.dump(d,f)
     
     start_time = time.time()
@@ -205,6 +215,7 @@ if __name__ == '__main__':
         d = {}
         d['real_regret_zero'] = np.asarray([d['real_regret'] for d in elicitation_zero if d is not None])
         d['inconsistency_zero'] = np.asarray([d['inconsistency'] for d in elicitation_zero if d is not None]) 
+        d['method_zero'] = [d['method_list'] for d in elicitation_zero if d is not None]
         pickle.dump(d,f)
     
     polytope_zero = [d['polytope_list'] for d in elicitation_zero if d is not None]
@@ -218,6 +229,7 @@ if __name__ == '__main__':
         d = {}
         d['real_regret_ignorance'] = np.asarray([d['real_regret'] for d in elicitation_ignorance if d is not None])
         d['inconsistency_ignorance'] = np.asarray([d['inconsistency'] for d in elicitation_ignorance if d is not None]) 
+        d['method_ignorance'] = [d['method_list'] for d in elicitation_ignorance if d is not None]
         pickle.dump(d,f)
     
     polytope_ignorance = [d['polytope_list'] for d in elicitation_ignorance if d is not None]
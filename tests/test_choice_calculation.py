@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""The PMR and the other values on a polytope are the same as from its vertices."""
+
+import numpy as np
+import pytest
+from alternatives.data_preparation import generate_alternatives_score
+from elicitation.models import ModelWeightedSum, ModelOWA
+from elicitation.polytope import Polytope, construct_constrainst, cut_polytope
+from elicitation.linear_program import compute_vertices
+from elicitation.choice_calculation import get_opti_alternatives, pmr_polytope, evaluate_polytope, \
+    lazy_mr_argmin
+
+MODELS = [ModelWeightedSum, ModelOWA]
+
+def _problem(seed, model_class, nb_answers = 3):
+    """
+    Random alternatives and a polytope cut by answers on them, without
+    anything computed on it yet.
+    """
+    np.random.seed(seed)
+    alternatives = generate_alternatives_score(8, nb_parameters = 4, value = 2)
+    model = model_class(np.random.dirichlet(np.ones(4)))
+    constraints = model.get_model_constrainsts()
+    polytope = Polytope(None, None, constraints['A_eq'], constraints['b_eq'], constraints['bounds'])
+    scores = model.get_model_score(alternatives) #Answers of the model: not empty.
+    for k in range(0, nb_answers):
+        constraint_a, constraint_b = construct_constrainst(alternatives[k], alternatives[k+1],
+                                                           scores[k] >= scores[k+1], model)
+        polytope.add_answer(constraint_a, constraint_b, 1)
+    return alternatives, model, polytope
+
+def _reference_pmr(alternatives, polytope, model):
+    """
+    The PMR from an enumeration of the vertices.
+    """
+    vertices = compute_vertices(*polytope.get_constrainsts(), polytope.get_bounds())
+    scores = vertices @ get_opti_alternatives(alternatives, model).T
+    return np.max(scores[:,np.newaxis,:] - scores[:,:,np.newaxis], axis = 0)
+
+@pytest.mark.parametrize('model_class', MODELS)
+@pytest.mark.parametrize('method', ['vertices', 'linprog', 'auto'])
+@pytest.mark.parametrize('seed', range(0, 5))
+def test_pmr(seed, method, model_class):
+    alternatives, model, polytope = _problem(seed, model_class)
+    np.testing.assert_allclose(pmr_polytope(alternatives, polytope, model, method),
+                               _reference_pmr(alternatives, polytope, model), atol = 10**-7)
+
+@pytest.mark.parametrize('model_class', MODELS)
+@pytest.mark.parametrize('method', ['vertices', 'linprog'])
+@pytest.mark.parametrize('seed', range(0, 5))
+def test_pmr_after_cut(seed, method, model_class):
+    alternatives, model, polytope = _problem(seed, model_class, nb_answers = 1)
+    pmr_polytope(alternatives, polytope, model, method) #Kept, then updated in the cells.
+    scores = model.get_model_score(alternatives)
+    constraint_a, constraint_b = construct_constrainst(alternatives[3], alternatives[4],
+                                                       scores[3] >= scores[4], model)
+    for new_polytope in cut_polytope(polytope, constraint_a, constraint_b, 0.7, 'product',
+                                     keep_vertices = method == 'vertices'):
+        if len(compute_vertices(*new_polytope.get_constrainsts(), new_polytope.get_bounds())) == 0:
+            continue
+        np.testing.assert_allclose(pmr_polytope(alternatives, new_polytope, model, method),
+                                   _reference_pmr(alternatives, new_polytope, model), atol = 10**-7)
+
+@pytest.mark.parametrize('seed', range(0, 5))
+def test_pmr_kept_for_its_model(seed):
+    alternatives, model, polytope = _problem(seed, ModelWeightedSum)
+    pmr_polytope(alternatives, polytope, model)
+    for other_model in (ModelOWA(model.get_model_parameters()),
+                        ModelWeightedSum(np.random.dirichlet(np.ones(4)))):
+        np.testing.assert_allclose(pmr_polytope(alternatives, polytope, other_model),
+                                   _reference_pmr(alternatives, polytope, other_model),
+                                   atol = 10**-7)
+
+@pytest.mark.parametrize('model_class', MODELS)
+@pytest.mark.parametrize('method', ['vertices', 'linprog'])
+@pytest.mark.parametrize('seed', range(0, 5))
+def test_evaluate_polytope(seed, method, model_class):
+    alternatives, model, polytope = _problem(seed, model_class)
+    res = evaluate_polytope(alternatives, polytope, model, method)
+    vertices = compute_vertices(*polytope.get_constrainsts(), polytope.get_bounds())
+    scores = vertices @ get_opti_alternatives(alternatives, model).T
+    reference_pmr = _reference_pmr(alternatives, polytope, model)
+    np.testing.assert_allclose(res['pmr'], reference_pmr, atol = 10**-7)
+    np.testing.assert_allclose(res['mr'], np.max(reference_pmr, axis = 1), atol = 10**-7)
+    np.testing.assert_allclose(res['min'], np.min(scores, axis = 0), atol = 10**-7)
+    np.testing.assert_allclose(res['max'], np.max(scores, axis = 0), atol = 10**-7)
+
+@pytest.mark.parametrize('model_class', MODELS)
+@pytest.mark.parametrize('method', ['vertices', 'linprog'])
+@pytest.mark.parametrize('seed', range(0, 5))
+def test_lazy_mr_argmin(seed, method, model_class):
+    alternatives, model, polytope = _problem(seed, model_class)
+    reference_mr = np.max(_reference_pmr(alternatives, polytope, model), axis = 1)
+    eligible = np.random.default_rng(seed).random(len(alternatives)) < 0.7
+    for eligible in (None, eligible):
+        best_alt_id, mr = lazy_mr_argmin(alternatives, polytope, model, eligible, method)
+        candidates = np.ones(len(alternatives), dtype = bool) if eligible is None else eligible
+        if not np.any(candidates):
+            assert best_alt_id == -1
+            continue
+        assert candidates[best_alt_id]
+        assert mr == pytest.approx(reference_mr[best_alt_id], abs = 10**-7)
+        assert mr == pytest.approx(np.min(reference_mr[candidates]), abs = 10**-7)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""The elicitation gives the same results whatever the method or backend."""
+
+import numpy as np
+import pytest
+from alternatives.data_preparation import generate_alternatives_score
+from elicitation.models import ModelWeightedSum, ModelOWA
+from elicitation.elicitation import robust_elicitation, possibilist_elicitation, get_recommendation
+from elicitation.linear_program import get_backend, set_backend, highspy
+
+BACKENDS = ['linprog', 'numpy'] + (['highs'] if highspy is not None else [])
+
+def _problem(seed, nb_questions = 5):
+    """
+    Random alternatives, model, confidences and answers.
+    """
+    np.random.seed(seed)
+    alternatives = generate_alternatives_score(10, nb_parameters = 4, value = 2)
+    weights = np.random.dirichlet(np.ones(4))
+    model = ModelOWA(weights) if seed % 2 == 1 else ModelWeightedSum(weights)
+    confidence = np.round(np.random.uniform(0.3, 0.99, nb_questions), 2)
+    rational = (np.random.rand(nb_questions) < 0.8).astype(int)
+    return alternatives, model, confidence, rational
+
+def _elicitation(seed, **kwargs):
+    """
+    The possibilist elicitation of a random problem, with its recommendation.
+    """
+    alternatives, model, confidence, rational = _problem(seed)
+    res = possibilist_elicitation(alternatives, model, confidence, max_iter = len(confidence),
+                                  rational = rational, **kwargs)
+    recommendation = get_recommendation(res['polytope_list'], res['possibility_list'],
+                                        alternatives, model)
+    return res, recommendation
+
+def _assert_same(res, reference):
+    """
+    Same polytopes (possibility and PMR), same choices.
+    """
+    res, recommendation = res
+    reference, reference_recommendation = reference
+    assert res['best_alternative'] == reference['best_alternative']
+    assert res['possibility_list'] == reference['possibility_list']
+    for pmr, reference_pmr in zip(res['value_list'], reference['value_list']):
+        np.testing.assert_allclose(pmr, reference_pmr, atol = 10**-7)
+    assert recommendation['best_alternative'] == reference_recommendation['best_alternative']
+
+@pytest.fixture
+def restore_backend():
+    backend = get_backend()
+    yield
+    set_backend(backend)
+
+@pytest.mark.parametrize('seed', range(0, 4))
+def test_same_for_all_methods(seed):
+    reference = _elicitation(seed, method = 'vertices')
+    for method in ('linprog', 'auto'):
+        res = _elicitation(seed, method = method)
+        _assert_same(res, reference)
+        assert set(res[0]['method_list']) <= {'vertices', 'linprog', None}
+
+@pytest.mark.parametrize('seed', range(0, 2))
+def test_same_for_all_backends(seed, restore_backend):
+    reference = _elicitation(seed, method = 'vertices')
+    for backend in BACKENDS:
+        set_backend(backend)
+        _assert_same(_elicitation(seed, method = 'linprog'), reference)
+
+@pytest.mark.parametrize('seed', range(0, 4))
+def test_robust_same_for_all_methods(seed):
+    alternatives, model, _, rational = _problem(seed)
+    reference = robust_elicitation(alternatives, model, max_iter = 5, rational = rational,
+                                   method = 'vertices')
+    for method in ('linprog', 'auto'):
+        res = robust_elicitation(alternatives, model, max_iter = 5, rational = rational,
+                                 method = method)
+        assert res['best_alternative'] == reference['best_alternative']
+        assert res['ite'] == reference['ite']
+
+@pytest.mark.parametrize('seed', range(0, 4))
+def test_same_with_spill(seed, tmp_path):
+    reference = _elicitation(seed)
+    for ram_budget in (0, 10**4):
+        res = _elicitation(seed, ram_budget = ram_budget, spill_directory = str(tmp_path))
+        _assert_same(res, reference)
+        assert res[0]['spilled_bytes'] > 0
+
+@pytest.mark.parametrize('seed', range(0, 4))
+def test_beam(seed):
+    reference = _elicitation(seed)
+    _assert_same(_elicitation(seed, max_polytopes = 10**6), reference)
+    for beam_rule in ('drop', 'merge'):
+        res, _ = _elicitation(seed, max_polytopes = 3, beam_rule = beam_rule)
+        nb_polytopes = len(res['polytope_list']) - (res['ignorance_polytope'] is not None)
+        assert nb_polytopes <= 3
+        if res['nb_discarded'] == 0:
+            assert res['discarded_possibility'] == 0
+        else:
+            assert 0 < res['discarded_possibility'] <= max(res['possibility_list'])
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""The criteria over the focal sets are the same as merging each focal set."""
+
+import numpy as np
+import pytest
+from elicitation.focal_set import compute_criteria, compute_epmr_emr, compute_emax_emin, FocalSets
+
+def _reference(value_list, possibility_list, function, inconsistency_type):
+    """
+    The expected value of a criterion: each focal set (the polytopes with a
+    possibility at least a level) merged on its own, weighted by the width
+    of its level.
+    """
+    value_list = list(value_list)
+    possibility_list = list(possibility_list)
+    if max(possibility_list) != 1:
+        if inconsistency_type == 'ignorance':
+            value_list.append(function.reduce(np.asarray(value_list), axis = 0))
+        else:
+            value_list.append(np.zeros(value_list[0].shape))
+        possibility_list.append(1)
+    levels = np.sort(np.unique(np.append(possibility_list, 0)))[::-1]
+    possibility_list = np.asarray(possibility_list)
+    res = 0
+    for i in range(0, len(levels) - 1):
+        focal_set = [value_list[j] for j in np.nonzero(possibility_list >= levels[i])[0]]
+        res = res + function.reduce(np.asarray(focal_set), axis = 0) * (levels[i] - levels[i+1])
+    return res
+
+def _polytopes(seed, nb_alternatives = 5):
+    """
+    Random PMR, max and min of some polytopes, with their possibility.
+    """
+    rng = np.random.default_rng(seed)
+    nb_polytopes = rng.integers(1, 8)
+    choices = [0, 0.2, 0.5, 0.7, 1] if seed % 2 == 0 else [0, 0.2, 0.5, 0.7]
+    possibility_array = rng.choice(choices, size = nb_polytopes)
+    possibility_array[0] = max(possibility_array[0], 0.2)
+    return (rng.normal(size = (nb_polytopes, nb_alternatives, nb_alternatives)),
+            possibility_array, rng.normal(size = (nb_polytopes, nb_alternatives)),
+            rng.normal(size = (nb_polytopes, nb_alternatives)))
+
+@pytest.mark.parametrize('inconsistency_type', ['ignorance', 'zero'])
+@pytest.mark.parametrize('seed', range(0, 20))
+def test_compute_criteria(inconsistency_type, seed):
+    pmr_array, possibility_array, max_array, min_array = _polytopes(seed)
+    inputs = [array.copy() for array in (pmr_array, possibility_array, max_array, min_array)]
+    res = compute_criteria(pmr_array, possibility_array, max_array, min_array, inconsistency_type)
+    np.testing.assert_allclose(res['epmr'], _reference(pmr_array, possibility_array, np.maximum,
+                                                       inconsistency_type))
+    np.testing.assert_allclose(res['emr'], _reference(np.max(pmr_array, axis = 2), possibility_array,
+                                                      np.maximum, inconsistency_type))
+    np.testing.assert_allclose(res['emax'], _reference(max_array, possibility_array, np.maximum,
+                                                       inconsistency_type))
+    np.testing.assert_allclose(res['emin'], _reference(min_array, possibility_array, np.minimum,
+                                                       inconsistency_type))
+    for array, copy in zip((pmr_array, possibility_array, max_array, min_array), inputs):
+        np.testing.assert_array_equal(array, copy) #Not changed.
+
+@pytest.mark.parametrize('inconsistency_type', ['ignorance', 'zero'])
+@pytest.mark.parametrize('seed', range(0, 20))
+def test_same_as_lists(inconsistency_type, seed):
+    pmr_array, possibility_array, max_array, min_array = _polytopes(seed)
+    res = compute_criteria(pmr_array, possibility_array, max_array, min_array, inconsistency_type)
+    epmr, emr = compute_epmr_emr(list(pmr_array), list(possibility_array), inconsistency_type)
+    np.testing.assert_allclose(epmr, res['epmr'])
+    np.testing.assert_allclose(emr, res['emr'])
+    np.testing.assert_allclose(compute_emax_emin(list(max_array), list(possibility_array),
+                                                 'maximax', inconsistency_type), res['emax'])
+    np.testing.assert_allclose(compute_emax_emin(list(min_array), list(possibility_array),
+                                                 'maximin', inconsistency_type), res['emin'])
+
+def test_unknown_criterion():
+    with pytest.raises(ValueError):
+        compute_emax_emin([np.ones(3)], [1], 'unknown')
+
+@pytest.mark.parametrize('inconsistency_type', ['ignorance', 'zero'])
+@pytest.mark.parametrize('seed', range(0, 10))
+def test_focal_sets_incremental(inconsistency_type, seed):
+    rng = np.random.default_rng(seed)
+    keys = [object() for _ in range(0, 8)]
+    pmr_list = list(rng.normal(size = (8, 4, 4)))
+    possibility_list = list(rng.choice([0.2, 0.5, 0.7, 1], size = 8))
+    focal_sets = FocalSets(inconsistency_type)
+    for _ in range(0, 6):
+        #Some polytopes removed, some changed (new PMR or possibility).
+        kept = np.nonzero(rng.random(8) < 0.8)[0]
+        if len(kept) == 0:
+            kept = [0]
+        for i in rng.choice(8, size = 2, replace = False):
+            if rng.random() < 0.5:
+                pmr_list[i] = rng.normal(size = (4, 4))
+            else:
+                possibility_list[i] = rng.choice([0.2, 0.5, 0.7, 1])
+        pmr_list[kept[0]] = pmr_list[kept[0]].copy() #The same values in a new array.
+        focal_sets.set_polytopes([keys[i] for i in kept], [pmr_list[i] for i in kept],
+                                 [possibility_list[i] for i in kept])
+        epmr, emr = focal_sets.compute_epmr_emr()
+        reference = compute_epmr_emr([pmr_list[i] for i in kept],
+                                     [possibility_list[i] for i in kept], inconsistency_type)
+        np.testing.assert_allclose(epmr, reference[0])
+        np.testing.assert_allclose(emr, reference[1])
+        assert len(focal_sets) == len(kept)
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""The T-norms and T-conorms are the same as their pairwise reduction."""
+
+from functools import reduce
+import numpy as np
+import pytest
+from elicitation.fusion import tnorm, tconorm
+
+PAIRWISE_TNORMS = {'minimum': min,
+                   'product': lambda a, b: a * b,
+                   'lukasiewicz': lambda a, b: max(0, a + b - 1)}
+PAIRWISE_TCONORMS = {'maximum': max,
+                     'probabilistic': lambda a, b: a + b - a * b,
+                     'bounded': lambda a, b: min(1, a + b)}
+
+def _information(seed):
+    """
+    Random pieces of information, with some zeros and ones.
+    """
+    rng = np.random.default_rng(seed)
+    information = rng.random((6, 5))
+    information[rng.random((6, 5)) < 0.1] = 0
+    information[rng.random((6, 5)) < 0.1] = 1
+    return information
+
+@pytest.mark.parametrize('rule', PAIRWISE_TNORMS)
+@pytest.mark.parametrize('seed', range(0, 5))
+def test_tnorm(rule, seed):
+    information = _information(seed)
+    reference = [reduce(PAIRWISE_TNORMS[rule], row) for row in information]
+    np.testing.assert_allclose(tnorm(information, rule, axis = 1), reference, atol = 10**-12)
+    np.testing.assert_allclose(tnorm(information.T, rule, axis = 0), reference, atol = 10**-12)
+    assert tnorm(information[0], rule) == pytest.approx(reference[0], abs = 10**-12)
+
+@pytest.mark.parametrize('rule', PAIRWISE_TCONORMS)
+@pytest.mark.parametrize('seed', range(0, 5))
+def test_tconorm(rule, seed):
+    information = _information(seed)
+    reference = [reduce(PAIRWISE_TCONORMS[rule], row) for row in information]
+    np.testing.assert_allclose(tconorm(information, rule, axis = 1), reference, atol = 10**-12)
+    np.testing.assert_allclose(tconorm(information.T, rule, axis = 0), reference, atol = 10**-12)
+    assert tconorm(information[0], rule) == pytest.approx(reference[0], abs = 10**-12)
+
+def test_unknown_rule():
+    with pytest.raises(NotImplementedError):
+        tnorm([0.5, 0.5], 'unknown')
+    with pytest.raises(NotImplementedError):
+        tconorm([0.5, 0.5], 'unknown')
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""The shortcuts of the l-out-of-k fusion give the same as listing the subsets."""
+
+import numpy as np
+import pytest
+from fusion.l_out_n import k_among_n_fusion, _listed_fusion, _product_probabilistic_fusion
+
+class _AnswersPolytope:
+    """
+    Only the answers of a polytope.
+    """
+
+    def __init__(self, answers):
+        self._answers = list(answers)
+
+    def get_answers(self):
+        return self._answers
+
+def _answers(seed, n, nb_polytopes = 5):
+    """
+    Random answers, many of them 1 (as the answers a polytope agrees with).
+    """
+    rng = np.random.default_rng(seed)
+    answers = rng.random((nb_polytopes, n))
+    answers[rng.random((nb_polytopes, n)) < 0.5] = 1
+    answers[rng.random((nb_polytopes, n)) < 0.05] = 0
+    return answers
+
+@pytest.mark.parametrize('tnorm_rule', ['minimum', 'product', 'lukasiewicz'])
+@pytest.mark.parametrize('tconorm_rule', ['maximum', 'probabilistic', 'bounded'])
+@pytest.mark.parametrize('seed', range(0, 5))
+def test_same_as_listed(tnorm_rule, tconorm_rule, seed):
+    n = 3 + seed
+    answers = _answers(seed, n)
+    for k in range(1, n + 1):
+        reference = _listed_fusion(answers, k, tnorm_rule, tconorm_rule)
+        fusion = k_among_n_fusion([_AnswersPolytope(row) for row in answers], k, n,
+                                  tnorm_rule, tconorm_rule)
+        np.testing.assert_allclose(fusion, reference, rtol = 0, atol = 10**-12)
+
+@pytest.mark.parametrize('seed', range(0, 5))
+def test_product_probabilistic_series(seed):
+    #Enough answers for the series to be used, its powers computed in small batches.
+    answers = 1 - np.random.default_rng(seed).uniform(0, 0.3, (20, 16))
+    for k in (8, 12):
+        reference = _listed_fusion(answers, k, 'product', 'probabilistic')
+        np.testing.assert_allclose(_product_probabilistic_fusion(answers, k, chunk_size = 50),
+                                   reference, rtol = 0, atol = 10**-12)
+
+def test_first_n_answers():
+    answers = [[0.5, 0.6, 0.7, 0.1], [0.9, 0.8, 0.2]]
+    fusion = k_among_n_fusion([_AnswersPolytope(row) for row in answers], 2, 3)
+    reference = _listed_fusion(np.array([row[0:3] for row in answers]), 2, 'product',
+                               'probabilistic')
+    np.testing.assert_allclose(fusion, reference, rtol = 0, atol = 10**-12)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""The LP backends give the same results."""
+
+import numpy as np
+import pytest
+from elicitation.linear_program import make_linear_program, compute_vertices, highspy
+
+BACKENDS = ['linprog', 'numpy'] + (['highs'] if highspy is not None else [])
+
+def _region(seed, nb_parameters = 4, nb_constrainsts = 6):
+    """
+    A random region of the simplex, with its constrainsts.
+    """
+    rng = np.random.default_rng(seed)
+    A_ub = rng.normal(size = (nb_constrainsts, nb_parameters))
+    b_ub = A_ub @ rng.dirichlet(np.ones(nb_parameters)) + rng.uniform(0, 0.2, nb_constrainsts)
+    return A_ub, b_ub, np.ones((1, nb_parameters)), np.array([1.]), [(0, 1)] * nb_parameters
+
+@pytest.mark.parametrize('seed', range(0, 10))
+def test_minimize_all_same_optima(seed):
+    region = _region(seed)
+    objectives = np.random.default_rng(seed).normal(size = (8, 4))
+    reference, _ = make_linear_program(*region, backend = 'linprog').minimize_all(objectives)
+    for backend in BACKENDS:
+        linear_program = make_linear_program(*region, backend = backend)
+        optima, points = linear_program.minimize_all(objectives)
+        np.testing.assert_allclose(optima, reference, atol = 10**-7)
+        np.testing.assert_allclose(np.sum(points * objectives, axis = 1), optima, atol = 10**-7)
+
+@pytest.mark.parametrize('seed', range(0, 10))
+def test_added_constraint_same_optima(seed):
+    A_ub, b_ub, A_eq, b_eq, bounds = _region(seed)
+    objectives = np.random.default_rng(seed).normal(size = (8, 4))
+    reference, _ = make_linear_program(A_ub, b_ub, A_eq, b_eq, bounds,
+                                       backend = 'linprog').minimize_all(objectives)
+    for backend in BACKENDS:
+        linear_program = make_linear_program(A_ub[:-1], b_ub[:-1], A_eq, b_eq, bounds,
+                                             backend = backend)
+        linear_program.minimize_all(objectives) #Then warm started, if the backend can.
+        linear_program.add_constraint(A_ub[-1], b_ub[-1])
+        optima, _ = linear_program.minimize_all(objectives)
+        np.testing.assert_allclose(optima, reference, atol = 10**-7)
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_empty_region(backend):
+    linear_program = make_linear_program(np.array([[1., 0], [-1., 0]]), np.array([0.2, -0.5]),
+                                         np.ones((1, 2)), np.array([1.]), [(0, 1)] * 2,
+                                         backend = backend)
+    optima, _ = linear_program.minimize_all(np.eye(2))
+    assert np.all(np.isnan(optima))
+    assert linear_program.find_point() is None
+
+@pytest.mark.parametrize('seed', range(0, 10))
+def test_remove_redundant_same_region(seed):
+    A_ub, b_ub, A_eq, b_eq, bounds = _region(seed)
+    #Looser copies of the constrainsts are redundant.
+    A_ub = np.vstack((A_ub, A_ub[0:2]))
+    b_ub = np.concatenate((b_ub, b_ub[0:2] + 0.1))
+    vertices = compute_vertices(A_ub, b_ub, A_eq, b_eq, bounds)
+    objectives = np.random.default_rng(seed).normal(size = (8, 4))
+    for backend in BACKENDS:
+        linear_program = make_linear_program(A_ub, b_ub, A_eq, b_eq, bounds, backend = backend)
+        linear_program.minimize_all(objectives)
+        _, removed_b = linear_program.remove_redundant()
+        assert len(removed_b) >= 2
+        optima, _ = linear_program.minimize_all(objectives)
+        np.testing.assert_allclose(optima, np.min(vertices @ objectives.T, axis = 0), atol = 10**-7)
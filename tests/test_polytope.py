@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""The polytopes keep the same region whatever their representation."""
+
+import pickle
+import numpy as np
+import pytest
+from elicitation.polytope import Polytope, intersection_checker, cut_polytope
+from elicitation.linear_program import compute_vertices
+
+def _simplex(nb_parameters = 3):
+    """
+    The whole model space of a weighted sum.
+    """
+    return Polytope(None, None, np.ones((1, nb_parameters)), [1], [(0, 1)] * nb_parameters)
+
+def _same_vertices(vertices, other_vertices):
+    """
+    Check that two sets of vertices are the same, in any order.
+    """
+    assert len(vertices) == len(other_vertices)
+    vertices = vertices[np.lexsort(np.round(vertices, 8).T)]
+    other_vertices = other_vertices[np.lexsort(np.round(other_vertices, 8).T)]
+    np.testing.assert_allclose(vertices, other_vertices, atol = 10**-8)
+
+@pytest.mark.parametrize('nb_answers', [0, 1, 3])
+def test_pickle(nb_answers):
+    polytope = _simplex()
+    for k in range(0, nb_answers):
+        polytope.add_answer(np.array([1., -1, 0]), [0.1 * k], 0.5)
+    copy = pickle.loads(pickle.dumps(polytope))
+    _same_vertices(copy.get_vertices(), polytope.get_vertices())
+    assert copy.get_answers() == polytope.get_answers()
+    copy.add_answer(np.array([0., 1, -1]), [0], 0.5) #The pool can grow again.
+    assert len(copy.get_answers()) == nb_answers + 1
+
+def _random_polytope(seed, nb_answers = 3):
+    """
+    The model space cut by random answers through random points of it,
+    without anything computed on it yet.
+    """
+    rng = np.random.default_rng(seed)
+    polytope = _simplex()
+    answers = []
+    for _ in range(0, nb_answers):
+        constraint_a = rng.normal(size = 3)
+        point = rng.dirichlet(np.ones(len(polytope.get_vertices()))) @ polytope.get_vertices()
+        answers.append((constraint_a, [constraint_a @ point]))
+        polytope.add_answer(*answers[-1], 0.5)
+    polytope = _simplex()
+    for constraint_a, constraint_b in answers:
+        polytope.add_answer(constraint_a, constraint_b, 0.5)
+    return polytope
+
+def _expected_side(vertices, constraint_a, constraint_b, tolerance = 10**-9):
+    """
+    The side of a polytope from its vertices, as intersection_checker.
+    """
+    values = vertices @ constraint_a
+    if np.max(values) <= constraint_b + tolerance:
+        return 1
+    if np.min(values) > constraint_b + tolerance:
+        return -1
+    return 0
+
+@pytest.mark.parametrize('seed', range(0, 10))
+def test_intersection_checker(seed):
+    rng = np.random.default_rng(seed)
+    vertices = _random_polytope(seed).get_vertices()
+    constraints = [rng.normal(size = 3) for _ in range(0, 10)]
+    constraints = [(constraint_a, constraint_a @ rng.dirichlet(np.ones(3)) + rng.normal(scale = 0.3))
+                   for constraint_a in constraints]
+    #Touching the polytope on a vertex, on each side.
+    constraints = constraints + [(constraint_a, np.max(vertices @ constraint_a))
+                                 for constraint_a, _ in constraints[0:2]]
+    constraints = constraints + [(constraint_a, np.min(vertices @ constraint_a))
+                                 for constraint_a, _ in constraints[0:2]]
+    for constraint_a, constraint_b in constraints:
+        expected = _expected_side(vertices, constraint_a, constraint_b)
+        for with_vertices in (True, False):
+            polytope = _random_polytope(seed) #Nothing known yet.
+            if with_vertices:
+                polytope.get_vertices()
+            assert intersection_checker(polytope, constraint_a, [constraint_b]) == expected
+
+@pytest.mark.parametrize('seed', range(0, 10))
+def test_remove_redundant_constrainsts(seed):
+    for with_vertices in (True, False):
+        polytope = _random_polytope(seed, nb_answers = 5)
+        vertices = compute_vertices(*polytope.get_constrainsts(), polytope.get_bounds())
+        A_ub, b_ub, _, _ = polytope.get_constrainsts()
+        #Looser copies of the constrainsts are redundant.
+        for constraint_a, constraint_b in zip(A_ub, b_ub):
+            polytope.add_answer(constraint_a, [constraint_b + 0.5], 1)
+        if with_vertices:
+            polytope.get_vertices()
+        polytope.remove_redundant_constrainsts()
+        assert len(polytope.get_constrainsts()[1]) <= len(b_ub)
+        _same_vertices(compute_vertices(*polytope.get_constrainsts(), polytope.get_bounds()),
+                       vertices)
+        assert len(polytope.get_answers()) == 5 + len(b_ub) #The answers are kept.
+
+@pytest.mark.parametrize('seed', range(0, 10))
+def test_cut_polytope_keep_vertices(seed):
+    rng = np.random.default_rng(seed)
+    polytope = _random_polytope(seed)
+    vertices = polytope.get_vertices()
+    constraint_a = rng.normal(size = 3)
+    constraint_b = np.array([constraint_a @ (rng.dirichlet(np.ones(len(vertices))) @ vertices)])
+    polytope_1, polytope_2 = cut_polytope(polytope, constraint_a, constraint_b, 0.7, 'product',
+                                          keep_vertices = True)
+    for new_polytope in (polytope_1, polytope_2):
+        _same_vertices(new_polytope.get_vertices(compute = False),
+                       compute_vertices(*new_polytope.get_constrainsts(), new_polytope.get_bounds()))
+    assert polytope_1.get_possibility() == pytest.approx(0.5)
+    assert polytope_2.get_possibility() == pytest.approx(0.5 * 0.3)
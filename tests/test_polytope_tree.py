@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""The leaves of the cut tree are a partition of the model space."""
+
+import numpy as np
+import pytest
+from elicitation.polytope import Polytope
+from elicitation.polytope_tree import PolytopeTree
+
+def _leaf_of(point, polytope_list):
+    """
+    The polytopes a point is in.
+    """
+    leaves = []
+    for polytope in polytope_list:
+        A_ub, b_ub, _, _ = polytope.get_constrainsts()
+        if A_ub is None or np.all(A_ub @ point <= b_ub + 10**-9):
+            leaves.append(polytope)
+    return leaves
+
+@pytest.mark.parametrize('keep_vertices', [True, False])
+@pytest.mark.parametrize('seed', range(0, 5))
+def test_partition(seed, keep_vertices):
+    rng = np.random.default_rng(seed)
+    polytope = Polytope(None, None, np.ones((1, 3)), [1], [(0, 1)] * 3)
+    if keep_vertices:
+        polytope.get_vertices()
+    tree = PolytopeTree(polytope)
+    answers = []
+    for _ in range(0, 6):
+        constraint_a = rng.normal(size = 3)
+        constraint_b = np.array([constraint_a @ rng.dirichlet(np.ones(3))])
+        confidence = rng.uniform(0.3, 0.99)
+        tree.add_answer(constraint_a, constraint_b, confidence, 'product',
+                        keep_vertices = keep_vertices)
+        answers.append((constraint_a, constraint_b[0], confidence))
+    polytope_list = tree.get_polytopes()
+    for point in rng.dirichlet(np.ones(3), size = 200):
+        leaves = _leaf_of(point, polytope_list)
+        assert len(leaves) == 1
+        possibility = np.prod([1 if constraint_a @ point <= constraint_b else 1 - confidence
+                               for constraint_a, constraint_b, confidence in answers])
+        assert leaves[0].get_possibility() == pytest.approx(possibility)
+    assert tree.get_possibility() == max(polytope.get_possibility() for polytope in polytope_list)
+
+def test_root_below_min_possibility():
+    polytope = Polytope(None, None, np.ones((1, 3)), [1], [(0, 1)] * 3)
+    tree = PolytopeTree(polytope)
+    #The whole model space is against the answer.
+    assert not tree.add_answer(np.array([-1., -1, -1]), np.array([-5.]), 0.9, 'product', 0.5)
+    assert tree.get_polytopes() == []
+    tree = PolytopeTree(polytope)
+    assert not tree.remove_polytopes({id(polytope)})
+    assert tree.get_polytopes() == []
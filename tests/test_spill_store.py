@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""The arrays moved to files keep their values."""
+
+import numpy as np
+from elicitation.spill_store import SpillStore, is_on_file
+from elicitation.polytope import Polytope
+
+def test_to_file():
+    store = SpillStore(0, slab_size = 1000)
+    arrays = [np.random.default_rng(seed).normal(size = (seed + 1, 7)) for seed in range(0, 10)]
+    moved = [store.to_file(array) for array in arrays] #Several slabs.
+    for array, on_file in zip(arrays, moved):
+        assert is_on_file(on_file)
+        assert not is_on_file(on_file.copy())
+        np.testing.assert_array_equal(array, on_file)
+    assert store.get_nbytes() == sum(array.nbytes for array in arrays)
+
+def test_balance():
+    polytope_list = []
+    for possibility in (1, 0.5, 0.2):
+        polytope = Polytope(None, None, np.ones((1, 3)), [1], [(0, 1)] * 3)
+        polytope.add_answer(np.array([1., -1, 0]), [0], possibility)
+        polytope.get_vertices()
+        polytope_list.append(polytope)
+    vertices = [polytope.get_vertices().copy() for polytope in polytope_list]
+    nbytes = polytope_list[0].get_nbytes()
+    store = SpillStore(nbytes)
+    store.balance(polytope_list)
+    #The least possible first, until the budget is met.
+    assert [polytope.get_nbytes() for polytope in polytope_list] == [nbytes, 0, 0]
+    for polytope, vertices_in_ram in zip(polytope_list, vertices):
+        np.testing.assert_array_equal(polytope.get_vertices(), vertices_in_ram)